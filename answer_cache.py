@@ -0,0 +1,155 @@
+# answer_cache.py — Shared exact + semantic answer cache for the LLM call sites
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+import config
+import metrics
+from text_search import WORD_RE, build_synonym_map, tokenize
+
+MAX_ENTRIES = 1024
+TTL_SECONDS = 6 * 60 * 60
+SIMILARITY_THRESHOLD = 0.75
+
+# Only true equivalents: FAQ_SYNONYMS also folds hyponyms together (gym/library
+# -> facility), which is fine for ranking FAQ entries but would let "gym timings"
+# be answered with the library's.
+CACHE_SYNONYMS = {
+    "course": ["courses", "program", "programs", "programme", "programmes", "degree", "degrees"],
+    "fee": ["fees", "cost", "costs", "price", "tuition"],
+    "timing": ["timings", "time", "times", "hours"],
+    "offer": ["offered", "offers", "available", "provide", "provided", "provides"],
+}
+_cache_synonyms = build_synonym_map(CACHE_SYNONYMS)
+# Words that rarely change what is being asked ("courses offered" = "courses")
+LOW_WEIGHT_TERMS = {"offer", "detail", "info", "information", "know", "list", "college", "rnsfgc"}
+LOW_WEIGHT = 0.25
+
+
+def normalize_question(text: str) -> str:
+    return " ".join(WORD_RE.findall(text.lower()))
+
+
+def question_terms(text: str) -> frozenset:
+    """Stemmed content words, stopwords dropped and synonyms folded together."""
+    return frozenset(tokenize(text, _cache_synonyms))
+
+
+def _weight(term: str) -> float:
+    return LOW_WEIGHT if term in LOW_WEIGHT_TERMS else 1.0
+
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    """Weighted Jaccard of two term sets; a content word on only one side costs a full point.
+
+    "what courses" / "courses offered?" -> 0.8, but "principal" / "vice principal" -> 0.5.
+    """
+    union = sum(_weight(t) for t in a | b)
+    return sum(_weight(t) for t in a & b) / union if union else 0.0
+
+
+def make_namespace(context: str, **params) -> str:
+    # Editing the prompt/FAQ text or any model parameter changes the namespace,
+    # so stale answers are simply never looked up again and age out via LRU/TTL.
+    payload = json.dumps({"context": context, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl_seconds: float = TTL_SECONDS,
+                 similarity_threshold: float = SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries = OrderedDict()  # (namespace, normalized question) -> (answer, terms, expires_at)
+        # (namespace, full-weight term) -> keys of semantic entries containing it; a
+        # semantic hit must share at least one, so only those entries are scored
+        self._by_term = defaultdict(set)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _lookup(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= now:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _index_terms(self, terms):
+        return [t for t in terms or () if _weight(t) == 1.0]
+
+    def _remove(self, key):
+        _, terms, _ = self._entries.pop(key)
+        for term in self._index_terms(terms):
+            keys = self._by_term.get((key[0], term))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_term[(key[0], term)]
+
+    def _most_similar(self, namespace: str, terms: frozenset):
+        candidates = set()
+        for term in self._index_terms(terms):
+            candidates |= self._by_term.get((namespace, term), set())
+        best_key, best_score = None, self.similarity_threshold
+        for other in candidates:
+            score = similarity(terms, self._entries[other][1])
+            if score >= best_score:
+                best_key, best_score = other, score
+        return best_key
+
+    def get(self, question: str, namespace: str, semantic: bool = True):
+        key = (namespace, normalize_question(question))
+        terms = question_terms(question) if semantic else None
+        now = time.monotonic()
+        with self._lock:
+            answer = self._lookup(key, now)
+            if answer is not None:
+                self.hits += 1
+                match = "exact"
+            elif terms and (other := self._most_similar(namespace, terms)) is not None:
+                answer = self._lookup(other, now)
+                if answer is not None:
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    match = "semantic"
+            if answer is None:
+                self.misses += 1
+                match = "none"
+        metrics.cache_result("answer", answer is not None, match=match)
+        return answer
+
+    def put(self, question: str, namespace: str, answer: str, semantic: bool = True):
+        key = (namespace, normalize_question(question))
+        terms = question_terms(question) if semantic else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (answer, terms, time.monotonic() + self.ttl_seconds)
+            for term in self._index_terms(terms):
+                self._by_term[(namespace, term)].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_term.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits,
+                    "semantic_hits": self.semantic_hits, "misses": self.misses}
+
+
+# Module-level instance: Streamlit keeps imported modules alive across reruns and
+# sessions, so every student in this process shares the same cache.
+answer_cache = AnswerCache(
+    similarity_threshold=getattr(config, "ANSWER_CACHE_SIMILARITY_THRESHOLD", SIMILARITY_THRESHOLD))
@@ -0,0 +1,180 @@
+# answer_store.py — Precomputed answers for canned questions, keyed by a hash of their inputs
+#
+# Warm up (re)generates only entries whose inputs changed:
+#   python answer_store.py            # stale/missing entries
+#   python answer_store.py --force    # everything
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+import config
+from answer_cache import normalize_question
+
+STORE_PATH = "answer_store.json"
+COLLEGE_INFO_PATH = "college_info.txt"
+
+# kind: "chat" (app.py Tab 1 prompt), "faq" (app_streamlit FAQ prompt) or "rag" (college_info.txt index)
+DEFAULT_CANNED_QUESTIONS = [
+    {"kind": "chat", "question": "What courses are offered?"},
+    {"kind": "chat", "question": "What facilities does the college have?"},
+    {"kind": "chat", "question": "What are the contact details?"},
+    {"kind": "chat", "question": "Is the college accredited?"},
+    {"kind": "chat", "question": "Which departments are there?"},
+    {"kind": "chat", "question": "Who founded the college and when?"},
+    {"kind": "faq", "question": "What courses are offered?"},
+    {"kind": "faq", "question": "What facilities are available?"},
+    {"kind": "faq", "question": "How can I contact the college?"},
+    {"kind": "faq", "question": "Is there a hostel?"},
+]
+
+
+def canned_questions() -> list:
+    return getattr(config, "CANNED_QUESTIONS", DEFAULT_CANNED_QUESTIONS)
+
+
+def _sha(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _file_hash(path: str) -> str:
+    if not os.path.exists(path):
+        return ""
+    with open(path, "rb") as f:
+        return _sha(f.read())
+
+
+def _chat_messages(question: str) -> list:
+    from prompt_builder import prompt_builder
+
+    system_prompt, _ = prompt_builder.compose(question)  # not a user request: no prompt metrics
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": question}]
+
+
+def source_hash(kind: str, question: str) -> str:
+    """Hash of everything the answer depends on: prompt text, data and model parameters."""
+    import assistant
+
+    if kind == "chat":
+        return _sha(kind, _chat_messages(question), assistant.DEFAULT_MODEL,
+                    assistant.CHAT_MAX_TOKENS, assistant.CHAT_TEMPERATURE)
+    if kind == "faq":
+        return _sha(kind, assistant.faq_messages(question), assistant.FAQ_MODEL, assistant.FAQ_MAX_TOKENS)
+    if kind == "rag":
+        return _sha(kind, question, _file_hash(COLLEGE_INFO_PATH))
+    raise ValueError(f"Unknown canned question kind: {kind}")
+
+
+def generate_answer(kind: str, question: str) -> str:
+    import assistant
+
+    if kind == "chat":
+        answer = assistant.groq_chat(_chat_messages(question), max_tokens=assistant.CHAT_MAX_TOKENS,
+                                     temperature=assistant.CHAT_TEMPERATURE, semantic_cache=False)
+        if answer.startswith("[Groq error]"):
+            raise RuntimeError(answer)
+        return answer
+    if kind == "faq":
+        return assistant.answer_faq(question)
+    if kind == "rag":
+        import rag_engine
+
+        return rag_engine.ask_agent(question)
+    raise ValueError(f"Unknown canned question kind: {kind}")
+
+
+class AnswerStore:
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self.entries = {}
+        self._valid = {}  # (kind, normalized question) -> answer, only entries whose hash still matches
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def entry_id(kind: str, question: str) -> str:
+        return f"{kind}:{normalize_question(question)}"
+
+    def load(self):
+        """Read the store and keep only entries whose inputs are unchanged, so stale answers are never served."""
+        entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        valid = {}
+        for entry in entries.values():
+            if entry.get("source_hash") == source_hash(entry["kind"], entry["question"]):
+                valid[(entry["kind"], normalize_question(entry["question"]))] = entry["answer"]
+        with self._lock:
+            self.entries, self._valid = entries, valid
+        return self
+
+    def lookup(self, kind: str, question: str):
+        return self._valid.get((kind, normalize_question(question)))
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def warm_up(self, questions=None, force: bool = False) -> dict:
+        """Generate missing or stale answers; entries no longer in the list are dropped."""
+        questions = canned_questions() if questions is None else questions
+        stats = {"generated": 0, "unchanged": 0, "failed": 0, "removed": 0}
+        keep = {}
+        for item in questions:
+            kind, question = item["kind"], item["question"]
+            entry_id = self.entry_id(kind, question)
+            current_hash = source_hash(kind, question)
+            entry = self.entries.get(entry_id)
+            if entry and entry.get("source_hash") == current_hash and not force:
+                keep[entry_id] = entry
+                stats["unchanged"] += 1
+                continue
+            try:
+                answer = generate_answer(kind, question)
+            except Exception as e:
+                print(f"  ! {entry_id}: {e}")
+                stats["failed"] += 1
+                continue
+            keep[entry_id] = {"kind": kind, "question": question, "source_hash": current_hash,
+                              "answer": answer, "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+            stats["generated"] += 1
+        stats["removed"] = len(set(self.entries) - set(keep))
+        self.entries = keep
+        self.save()
+        self.load()
+        return stats
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_answer_store() -> AnswerStore:
+    """Process-wide store, loaded once at startup."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AnswerStore().load()
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute answers for canned questions")
+    parser.add_argument("--force", action="store_true", help="regenerate every entry")
+    args = parser.parse_args()
+    stats = AnswerStore().load().warm_up(force=args.force)
+    print(f"Generated: {stats['generated']}, unchanged: {stats['unchanged']}, "
+          f"failed: {stats['failed']}, removed: {stats['removed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# api_server.py — Headless asyncio JSON API for chat, FAQ, RAG, grading and PDF export
+#
+#   python api_server.py --workers 4 --port 8000
+#
+# Each worker process runs its own event loop; CPU-bound work (PDF rendering,
+# embeddings/retrieval) goes to executors so the loop keeps serving requests.
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+import metrics
+from assistant import faq_matcher
+from grading import compute_grades
+from model_router import model_router
+from pdf_export import generate_pdf_bytes
+from prompt_builder import prompt_builder
+
+PDF_WORKERS = int(os.environ.get("API_PDF_WORKERS", "2"))
+BLOCKING_WORKERS = int(os.environ.get("API_BLOCKING_WORKERS", "8"))
+MAX_TOKENS_LIMIT = 1024
+CHAT_ROLES = {"system", "user", "assistant"}
+
+_executors = {}
+
+
+def _render_pdf(title: str, content: str) -> bytes:
+    return generate_pdf_bytes(title, content).getvalue()
+
+
+def _ask_agent(query: str) -> str:
+    import rag_engine  # loads the embedding model and vector index on first use in this worker
+
+    return rag_engine.ask_agent(query)
+
+
+async def _run(kind: str, fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executors[kind], fn, *args)
+
+
+def _error(message: str, status: int = 400) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+async def _json_body(request) -> dict:
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise ValueError("Request body must be JSON.")
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object.")
+    return body
+
+
+def _chat_messages(body: dict) -> list:
+    """Accept either a full `messages` list or a single `question` answered with the college prompt."""
+    if "messages" in body:
+        messages = body["messages"]
+        if not isinstance(messages, list) or not messages:
+            raise ValueError("'messages' must be a non-empty list.")
+        for m in messages:
+            if not (isinstance(m, dict) and m.get("role") in CHAT_ROLES and isinstance(m.get("content"), str)):
+                raise ValueError("Each message needs a 'role' (system, user or assistant) and string 'content'.")
+        return messages
+    question = str(body.get("question", "")).strip()
+    if not question:
+        raise ValueError("Provide 'question' or 'messages'.")
+    system_prompt, _ = prompt_builder.build(question)
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": question}]
+
+
+def _grade_inputs(matrix, max_marks) -> tuple:
+    """(marks, max_marks) as float arrays, or ValueError for anything compute_grades cannot grade sensibly."""
+    try:
+        marks = np.asarray(matrix, dtype=np.float64)
+        max_marks = np.asarray(max_marks, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("Marks and 'max_marks' must be numbers, with the same number of subjects per student.")
+    if marks.ndim != 2 or marks.shape[1] == 0:
+        raise ValueError("'students' must be a list of lists of marks.")
+    if max_marks.ndim > 1 or (max_marks.ndim == 1 and max_marks.shape != (marks.shape[1],)):
+        raise ValueError("'max_marks' must be one number or one number per subject.")
+    if not (np.isfinite(marks).all() and np.isfinite(max_marks).all()):
+        raise ValueError("Marks and 'max_marks' must be finite numbers.")
+    if (max_marks <= 0).any():
+        raise ValueError("'max_marks' must be positive.")
+    return marks, max_marks
+
+
+# ---------------------------
+# Endpoints
+# ---------------------------
+async def health(request):
+    return JSONResponse({"status": "ok", "pid": os.getpid()})
+
+
+async def metrics_endpoint(request):
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+def _chat_params(body: dict) -> dict:
+    """temperature/model/max_tokens from the body; the router picks whatever the caller does not pin."""
+    try:
+        temperature = float(body.get("temperature", 0.12))
+        max_tokens = int(body["max_tokens"]) if "max_tokens" in body else None
+    except (TypeError, ValueError):
+        raise ValueError("'temperature' must be a number and 'max_tokens' an integer.")
+    if not 0 <= temperature <= 2:
+        raise ValueError("'temperature' must be between 0 and 2.")
+    if max_tokens is not None and max_tokens < 1:
+        raise ValueError("'max_tokens' must be positive.")
+    model = body.get("model")
+    if model is not None and not (isinstance(model, str) and model.strip()):
+        raise ValueError("'model' must be a non-empty string.")
+    return {
+        "temperature": temperature,
+        "model": model,
+        "max_tokens": min(max_tokens, MAX_TOKENS_LIMIT) if max_tokens is not None else None,
+    }
+
+
+async def chat(request):
+    try:
+        body = await _json_body(request)
+        messages = _chat_messages(body)
+        params = _chat_params(body)
+    except ValueError as e:
+        return _error(str(e))
+
+    if body.get("stream"):
+        async def events():
+            stats = {}
+            async for delta in model_router.achat_stream(messages, stats=stats, **params):
+                # An upstream failure arrives as the last piece, with stats["error"] already set
+                event = {"error": f"[Groq error] {stats['error']}"} if stats.get("error") else {"delta": delta}
+                yield f"data: {json.dumps(event)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    stats = {}
+    answer = await model_router.achat(messages, stats=stats, **params)
+    if stats.get("error"):
+        return _error(f"[Groq error] {stats['error']}", status=502)
+    return JSONResponse({"answer": answer, "route": stats["route"], "model": stats["model"]})
+
+
+async def faq(request):
+    try:
+        body = await _json_body(request)
+    except ValueError as e:
+        return _error(str(e))
+    question = str(body.get("question", "")).strip()
+    if not question:
+        return _error("Provide 'question'.")
+
+    local_answer, confidence = faq_matcher.answer(question)
+    if local_answer is not None:
+        return JSONResponse({"answer": local_answer, "source": "faq", "confidence": confidence})
+    try:
+        answer = await model_router.afaq(question)
+    except Exception as e:
+        return _error(f"[Groq error] {e}", status=502)
+    return JSONResponse({"answer": answer, "source": "llm", "confidence": confidence})
+
+
+async def ask(request):
+    try:
+        body = await _json_body(request)
+    except ValueError as e:
+        return _error(str(e))
+    query = str(body.get("query", "")).strip()
+    if not query:
+        return _error("Provide 'query'.")
+    try:
+        answer = await _run("blocking", _ask_agent, query)
+    except Exception as e:
+        return _error(f"{type(e).__name__}: {e}", status=502)
+    return JSONResponse({"answer": answer})
+
+
+async def grades(request):
+    """Body: {"marks": {"Maths": 80, ...}} for one student or {"students": [[...], ...]} for a class."""
+    try:
+        body = await _json_body(request)
+    except ValueError as e:
+        return _error(str(e))
+    if isinstance(body.get("marks"), dict) and body["marks"]:
+        matrix = [list(body["marks"].values())]
+    elif isinstance(body.get("students"), list) and body["students"]:
+        matrix = body["students"]
+    else:
+        return _error("Provide 'marks' (object) or 'students' (list of lists).")
+    try:
+        result = compute_grades(*_grade_inputs(matrix, body.get("max_marks", 100)))
+    except ValueError as e:
+        return _error(str(e))
+    return JSONResponse({key: values.tolist() for key, values in result.items()})
+
+
+async def pdf(request):
+    try:
+        body = await _json_body(request)
+    except ValueError as e:
+        return _error(str(e))
+    title = str(body.get("title", "Document"))
+    content = str(body.get("content", ""))
+    with metrics.span("pdf_render", endpoint="api"):
+        data = await _run("pdf", _render_pdf, title, content)
+    return Response(data, media_type="application/pdf",
+                    headers={"Content-Disposition": 'attachment; filename="document.pdf"'})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    _executors["pdf"] = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    _executors["blocking"] = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS)
+    try:
+        yield
+    finally:
+        for executor in _executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _executors.clear()
+
+
+app = Starlette(
+    routes=[
+        Route("/health", health),
+        Route("/metrics", metrics_endpoint),
+        Route("/chat", chat, methods=["POST"]),
+        Route("/faq", faq, methods=["POST"]),
+        Route("/ask", ask, methods=["POST"]),
+        Route("/grades", grades, methods=["POST"]),
+        Route("/pdf", pdf, methods=["POST"]),
+    ],
+    lifespan=lifespan,
+)
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="AI Student Assistant JSON API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    uvicorn.run("api_server:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
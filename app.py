@@ -1,65 +1,26 @@
 # app.py — Final production-ready Groq app (Pomodoro section removed)
 import streamlit as st
-from groq import Groq
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from io import BytesIO
+import tempfile
 import time
-from config import GROQ_API_KEY  # create config.py with GROQ_API_KEY = "gsk_..."
-
-# ---------------------------
-# Initialize Groq client
-# ---------------------------
-client = Groq(api_key=GROQ_API_KEY)
-
-# ---------------------------
-# Embedded college info (official + brochure)
-# ---------------------------
-COLLEGE_OFFICIAL = """
-RNS First Grade College (RNSFGC) — Official Information
-- Established: 2012.
-- Founder: Industrialist-philanthropist Dr. R. N. Shetty.
-- Status: Autonomous (recently converted to autonomous status).
-- Accreditation: NAAC accredited with an 'A' grade.
-- Educational focus: Value-driven education, experiential learning, skill development, discipline, and holistic student growth.
-- Mission highlights: Maintain academic excellence with integrity; promote holistic personal development; bridge theory & practice via labs, projects, and industry-relevant curriculum; prepare students for careers with training and placements; nurture socially aware, value-based, culturally rooted individuals.
-- Courses / Programs:
-  • UG: Bachelor of Computer Applications (BCA), Bachelor of Commerce (B.Com), Bachelor of Business Administration (BBA)
-  • PG: Master of Business Administration (MBA)
-- Departments: Computer Applications (BCA), Commerce (B.Com), Management (BBA), MBA department.
-- Facilities: Well-equipped computer labs & IT infrastructure, library & digital library, hostel accommodation, auditorium/seminar halls, sports & recreation facilities (outdoor & indoor), canteen/food court, ICT-enabled classrooms / smart classrooms, fitness & wellness facilities.
-- Contact & Location:
-  RNS First Grade College, Dr. Vishnuvardhan Road, Channasandra, RR Nagar, Bengaluru – 560098
-  Phone: 080-28611110 / 9141095892
-  Emails: enquiryrnsfgc@gmail.com, principal_rnsfgc@rnsgi.com, vp_rnsfgc@rnsgi.com, rnsfgccollege2012@gmail.com
-"""
-
-COLLEGE_BROCHURE = """
-RNS First Grade College — Professional Brochure Summary
-RNSFGC is a modern, autonomous institution committed to shaping well-rounded professionals through a blend of rigorous academics and practical exposure. The college emphasizes:
-• Academic excellence and ethical conduct
-• Industry-relevant training and hands-on learning
-• Leadership, communication, and personal growth
-Programs include BCA, B.Com, BBA at the undergraduate level and MBA at the postgraduate level. Campus life supports learning through advanced computer labs, a comprehensive library (digital + physical), sports and cultural activities, smart classrooms, auditoriums for seminars, and residential facilities for outstation students. RNSFGC prepares students for contemporary careers with placement-oriented programs, value-based education, and opportunities for experiential projects.
-"""
-
-SYSTEM_PROMPT = f"""
-You are an AI assistant specialized for RNS First Grade College (RNSFGC), Bengaluru.
-Use the official details and brochure below to answer student queries accurately.
-
---- OFFICIAL INFO (use this for factual answers) ---
-{COLLEGE_OFFICIAL}
-
---- PROFESSIONAL BROCHURE SUMMARY (use for polished descriptions) ---
-{COLLEGE_BROCHURE}
-
-Guidelines:
-- Always prefer factual accuracy using OFFICIAL INFO for facts (courses, contact, accreditation, departments, facilities, year, founder).
-- For promotional or brochure-style responses use BROCHURE text.
-- Keep answers concise, structured; use bullets/lists where helpful.
-- If the answer is not present in the provided info, reply exactly: "I could not find this information in the college data I was given."
-- Avoid inventing facts. Be professional and student-friendly.
-"""
+import uuid
+import metrics
+import timing
+
+# Project modules build their clients, prompts and indexes once per process on
+# first import; later reruns find them in sys.modules, so "imports" drops to ~0.
+rerun_timer = timing.RerunTimer()
+with rerun_timer.section("imports"):
+    from answer_store import get_answer_store
+    from assistant import CHAT_TEMPERATURE
+    from chat_memory import ChatMemory
+    from grading import INCOMPLETE, compute_grades, grade_table, read_marks_table, subject_columns
+    from pdf_export import generate_pdf_bytes, grade_report_jobs, render_many, zip_files
+    from model_router import model_router
+    from prompt_builder import prompt_builder
+    from study_planner import STUDY_SECTIONS, format_plan, iter_study_plan
+    from todo_store import PAGE_SIZE, get_todo_store
+    answer_store = get_answer_store()
+    todo_store = get_todo_store()
 
 # ---------------------------
 # Page config + CSS (dark premium)
@@ -91,51 +52,49 @@ st.markdown(
 st.markdown("<div class='title'>🎓 AI Student Assistant</div>", unsafe_allow_html=True)
 
 # ---------------------------
-# Groq wrapper
-# ---------------------------
-def groq_chat(messages, max_tokens: int = 400, temperature: float = 0.15, model: str = "llama-3.1-8b-instant"):
-    try:
-        resp = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            max_tokens=max_tokens,
-            temperature=temperature
-        )
-        return resp.choices[0].message.content.strip()
-    except Exception as e:
-        return f"[Groq error] {e}"
-
-# ---------------------------
-# PDF generator
+# Rendering helpers
 # ---------------------------
-def generate_pdf_bytes(title: str, content: str) -> BytesIO:
-    buff = BytesIO()
-    pdf = canvas.Canvas(buff, pagesize=letter)
-    width, height = letter
-    y = height - 60
-
-    pdf.setFont("Helvetica-Bold", 16)
-    pdf.drawString(50, y, title)
-    y -= 30
-
-    pdf.setFont("Helvetica", 11)
-    for line in content.split("\n"):
-        if y < 50:
-            pdf.showPage()
-            pdf.setFont("Helvetica", 11)
-            y = height - 50
-        pdf.drawString(50, y, line)
-        y -= 16
-
-    pdf.save()
-    buff.seek(0)
-    return buff
+def college_prompt(question: str) -> str:
+    """System prompt holding only the college sections relevant to `question`."""
+    prompt, info = prompt_builder.build(question)
+    st.session_state.prompt_tokens_saved += info["saved_tokens"]
+    st.caption(f"Prompt: ~{info['prompt_tokens']} tokens from {', '.join(info['sections'])} "
+               f"(saved ~{info['saved_tokens']} this request, ~{st.session_state.prompt_tokens_saved} this session)")
+    return prompt
+
+
+def render_stream(pieces, stats: dict):
+    """Render streamed text progressively into an .output card and log its timings."""
+    placeholder = st.empty()
+    text = ""
+    render_s = 0.0
+    for piece in pieces:
+        text += piece
+        render_start = time.perf_counter()
+        placeholder.markdown(f"<div class='output'>{text}▌</div>", unsafe_allow_html=True)
+        render_s += time.perf_counter() - render_start
+    with metrics.span("render"):
+        placeholder.markdown(f"<div class='output'>{text.strip()}</div>", unsafe_allow_html=True)
+    metrics.observe("assistant_stage_seconds", render_s, stage="render", endpoint="stream_updates")
+
+    if stats.get("ttft_s") is not None:
+        source = "cache" if stats.get("cached") else "shared request" if stats.get("coalesced") else "Groq"
+        if stats.get("route"):
+            source += f", {stats['route']} → {stats['model']}"
+        st.caption(f"First token in {stats['ttft_s']:.2f}s · done in {stats['total_s']:.2f}s ({source})")
+    return text.strip()
 
 # ---------------------------
 # Session state defaults
 # ---------------------------
-if "todo" not in st.session_state:
-    st.session_state.todo = []
+if "user_id" not in st.session_state:
+    # The id lives in the URL, so bookmarking or reloading the page finds the same tasks and notes
+    st.session_state.user_id = st.query_params.get("user") or uuid.uuid4().hex[:12]
+    st.query_params["user"] = st.session_state.user_id
+if "prompt_tokens_saved" not in st.session_state:
+    st.session_state.prompt_tokens_saved = 0
+if "chat_memory" not in st.session_state:
+    st.session_state.chat_memory = ChatMemory()
 
 # ---------------------------
 # Tabs layout
@@ -145,36 +104,54 @@ tab1, tab2, tab3 = st.tabs(["🤖 Chat Assistant", "📘 Grade Calculator", "
 # ---------------------------
 # TAB 1 — Chat Assistant
 # ---------------------------
-with tab1:
+with tab1, rerun_timer.section("chat tab"):
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown("<div class='section'>🤖 Chat Assistant (Groq LLM)</div>", unsafe_allow_html=True)
 
+    memory = st.session_state.chat_memory
+    if len(memory) or memory.summary:
+        with st.expander(f"Conversation so far ({len(memory)} recent turns, ~{memory.tokens()} tokens of memory)"):
+            if memory.summary:
+                st.markdown(f"<div class='small'>Earlier: {memory.summary}</div>", unsafe_allow_html=True)
+            for q, a in memory.turns:
+                st.markdown(f"**You:** {q}")
+                st.markdown(a)
+
     chat_q = st.text_input("Ask a question about RNSFGC, courses, facilities, contacts, or student life", key="chat_q_input")
-    c1, c2 = st.columns([1, 1])
+    c1, c2, c3 = st.columns([1, 1, 1])
 
     with c1:
         if st.button("Ask Groq", key="ask_groq_btn"):
             if not chat_q.strip():
                 st.warning("Please enter a question.")
+            elif not len(memory) and (stored := answer_store.lookup("chat", chat_q)) is not None:
+                st.markdown(f"<div class='output'>{stored}</div>", unsafe_allow_html=True)
+                st.caption("Precomputed answer")
+                memory.add(chat_q, stored)
             else:
-                with st.spinner("Contacting Groq for an answer..."):
-                    messages = [
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": chat_q}
-                    ]
-                    ans = groq_chat(messages, max_tokens=450, temperature=0.12)
-                    st.markdown(f"<div class='output'>{ans}</div>", unsafe_allow_html=True)
+                # Earlier turns ride along (bounded by the memory budget) so follow-ups keep their context
+                messages = memory.messages(college_prompt(memory.context_query(chat_q)), chat_q)
+                stats = {}
+                # The router picks model and token budget from the kind of question
+                answer = render_stream(model_router.chat_stream(messages, temperature=CHAT_TEMPERATURE, stats=stats),
+                                       stats)
+                memory.add(chat_q, answer)
 
     with c2:
         if st.button("Clear Chat Input", key="clear_chat_btn"):
             st.session_state.chat_q_input = ""
 
+    with c3:
+        if st.button("New Conversation", key="new_chat_btn"):
+            memory.clear()
+            st.rerun()
+
     st.markdown("</div>", unsafe_allow_html=True)
 
 # ---------------------------
 # TAB 2 — Grade Calculator
 # ---------------------------
-with tab2:
+with tab2, rerun_timer.section("grades tab"):
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown("<div class='section'>📘 Grade Calculator</div>", unsafe_allow_html=True)
 
@@ -196,23 +173,12 @@ with tab2:
         if any(s == "" for s in subjects):
             st.warning("Please fill all subject names.")
         else:
-            total = sum(marks)
-            possible = 100 * len(marks)
-            percentage = (total / possible) * 100
-            cgpa = percentage / 9.5
-
-            if percentage >= 90:
-                grade = "A+"
-            elif percentage >= 80:
-                grade = "A"
-            elif percentage >= 70:
-                grade = "B+"
-            elif percentage >= 60:
-                grade = "B"
-            elif percentage >= 50:
-                grade = "C"
-            else:
-                grade = "Fail"
+            result = compute_grades([marks], max_marks=100)
+            total = int(result["total"][0])
+            possible = int(result["possible"][0])
+            percentage = result["percentage"][0]
+            cgpa = result["cgpa"][0]
+            grade = result["grade"][0]
 
             detail_html = "".join([f"<li><b>{subjects[i]}</b>: {marks[i]}</li>" for i in range(len(subjects))])
 
@@ -222,39 +188,85 @@ with tab2:
                         f"<b>CGPA(Est):</b> {cgpa:.2f}<br>"
                         f"<b>Grade:</b> {grade}</div>", unsafe_allow_html=True)
 
+    with st.expander("Bulk grading for a whole class (CSV / Excel)"):
+        st.markdown("<div class='hint'>One row per student, one numeric column per subject; "
+                    "text and ID columns (name, USN, roll no.) are kept as-is.</div>", unsafe_allow_html=True)
+        bulk_file = st.file_uploader("Upload marks sheet", type=["csv", "xlsx"], key="bulk_marks_file")
+        bulk_max = st.number_input("Maximum marks per subject", min_value=1, value=100, key="bulk_max_marks")
+        if bulk_file is not None:
+            try:
+                marks_df = read_marks_table(bulk_file.getvalue(), bulk_file.name)
+                subjects = st.multiselect("Subject columns", list(marks_df.select_dtypes(include="number").columns),
+                                          default=subject_columns(marks_df), key="bulk_subjects")
+                graded = grade_table(marks_df, max_marks=bulk_max, subjects=subjects)
+            except (ValueError, ImportError) as e:
+                st.warning(str(e))
+            else:
+                if (incomplete := int((graded["Grade"] == INCOMPLETE).sum())):
+                    st.warning(f"{incomplete} student(s) have missing marks and were not graded (see Missing).")
+                st.dataframe(graded, width="stretch")
+                st.download_button("Download results (CSV)", graded.to_csv(index=False).encode("utf-8"),
+                                   file_name="grade_results.csv", mime="text/csv", key="bulk_grades_download")
+                if st.button("Prepare per-student PDF reports", key="bulk_reports_btn"):
+                    with st.spinner(f"Rendering {len(graded)} reports..."), tempfile.TemporaryDirectory() as out_dir:
+                        reports_zip = zip_files(render_many(grade_report_jobs(graded), out_dir))
+                    st.download_button("Download reports (ZIP)", reports_zip, file_name="grade_reports.zip",
+                                       mime="application/zip", key="bulk_reports_download")
+
     st.markdown("</div>", unsafe_allow_html=True)
 
 # ---------------------------
 # TAB 3 — Productivity Dashboard
 # ---------------------------
-with tab3:
+with tab3, rerun_timer.section("productivity tab"):
     st.markdown("<div class='card'>", unsafe_allow_html=True)
     st.markdown("<div class='section'>📚 Student Productivity Dashboard</div>", unsafe_allow_html=True)
 
     # Notes / To-Do List
     st.subheader("📝 Notes / To-Do List")
-    notes = st.text_area("Write your notes here...", height=180, key="notes_text")
+    user_id = st.session_state.user_id
+    if "notes_text" not in st.session_state:
+        st.session_state.notes_text = todo_store.get_note(user_id)
+    notes = st.text_area("Write your notes here...", height=180, key="notes_text",
+                         on_change=lambda: todo_store.save_note(user_id, st.session_state.notes_text))
+    st.caption(f"Saved automatically for this link (user {user_id}).")
     new_task = st.text_input("Add a To-Do item", key="new_task")
 
-    t1, t2 = st.columns([1, 1])
+    t1, t2, t3 = st.columns([1, 1, 1])
 
     with t1:
         if st.button("Add Task", key="add_task_btn"):
             if new_task.strip():
-                st.session_state.todo.append(new_task.strip())
+                todo_store.add_task(user_id, new_task.strip())
                 st.success("Task added.")
             else:
                 st.warning("Please type a task.")
 
     with t2:
+        if st.button("Clear Done", key="clear_done_btn"):
+            todo_store.clear_tasks(user_id, status="done")
+            st.info("Completed tasks cleared.")
+
+    with t3:
         if st.button("Clear Tasks", key="clear_tasks_btn"):
-            st.session_state.todo = []
+            todo_store.clear_tasks(user_id)
             st.info("Tasks cleared.")
 
-    if st.session_state.todo:
-        st.markdown("**Your To-Do:**")
-        for idx, t in enumerate(st.session_state.todo, 1):
-            st.markdown(f"{idx}. {t}")
+    show = st.radio("Show", ["open", "done", "all"], horizontal=True, key="todo_filter")
+    status = None if show == "all" else show
+    total = todo_store.count_tasks(user_id, status)
+    if total:
+        # Only the visible page is read and rendered, however long the list grows
+        pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+        page = 0
+        if pages > 1:
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key="todo_page") - 1
+        st.markdown(f"**Your To-Do ({total}):**")
+        for idx, (task_id, text, task_status) in enumerate(todo_store.list_tasks(user_id, status, page),
+                                                           page * PAGE_SIZE + 1):
+            st.checkbox(f"{idx}. {text}", value=task_status == "done", key=f"todo_{task_id}",
+                        on_change=lambda tid=task_id: todo_store.set_status(
+                            user_id, tid, "done" if st.session_state[f"todo_{tid}"] else "open"))
 
     st.markdown("---")
 
@@ -269,18 +281,36 @@ with tab3:
             if not study_topic.strip():
                 st.warning("Please enter a study topic.")
             else:
-                with st.spinner("Generating study suggestions..."):
-                    prompt = (
-                        f"Create a focused study plan for a student on the topic: {study_topic}. "
-                        "Include: (1) a 2-hour plan broken into Pomodoro cycles, (2) a 7-day weekly plan, "
-                        "(3) memory & practice tips, and (4) one sample practice question."
-                    )
-                    suggestions = groq_chat([{"role": "system", "content": SYSTEM_PROMPT},
-                                             {"role": "user", "content": prompt}], max_tokens=450)
-                    st.markdown(f"<div class='output'>{suggestions}</div>", unsafe_allow_html=True)
+                # The four sections are requested concurrently and each streams into its own slot
+                slots = {key: st.empty() for key, _, _, _ in STUDY_SECTIONS}
+                for key, title, _, _ in STUDY_SECTIONS:
+                    slots[key].markdown(f"<div class='small'>⏳ {title}…</div>", unsafe_allow_html=True)
+                sections = {key: "" for key, _, _, _ in STUDY_SECTIONS}
+                start, first_text_s = time.perf_counter(), None
+                for key, title, piece in iter_study_plan(study_topic, college_prompt(study_topic)):
+                    if piece is None:
+                        sections[key] = sections[key].strip()
+                        slots[key].markdown(f"**{title}**\n\n<div class='output'>{sections[key]}</div>",
+                                            unsafe_allow_html=True)
+                        continue
+                    if first_text_s is None:
+                        first_text_s = time.perf_counter() - start
+                    sections[key] += piece
+                    slots[key].markdown(f"**{title}**\n\n<div class='output'>{sections[key]}▌</div>",
+                                        unsafe_allow_html=True)
+                if first_text_s is not None:
+                    st.caption(f"First text in {first_text_s:.2f}s · plan ready in "
+                               f"{time.perf_counter() - start:.2f}s")
+                plan = format_plan(sections)
+                st.download_button("Download plan (PDF)", generate_pdf_bytes(f"Study Plan: {study_topic}", plan),
+                                   file_name="study_plan.pdf", mime="application/pdf", key="study_plan_pdf")
 
     with s2:
         if st.button("Quick Tips (Local)", key="quick_tips_btn"):
             st.info("Use Pomodoro (25/5), active recall, spaced repetition, solve previous-year questions, teach back topics.")
 
     st.markdown("</div>", unsafe_allow_html=True)
+
+timing.render_report(st, rerun_timer)
+if metrics.admin_panel_enabled(st):
+    metrics.render_admin_panel(st)
@@ -1,6 +1,14 @@
 import streamlit as st
-from groq import Groq
-from config import GROQ_API_KEY
+import metrics
+import timing
+
+rerun_timer = timing.RerunTimer()
+with rerun_timer.section("imports"):
+    from answer_store import get_answer_store
+    from assistant import faq_matcher
+    from model_router import model_router
+    from grading import INCOMPLETE, calculate_multi_subject_grades, grade_table, read_marks_table, subject_columns
+    answer_store = get_answer_store()
 
 # ============================================
 # BEAUTIFUL CUSTOM PAGE CONFIG
@@ -56,111 +64,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# ============================================
-# FIXED FAQ DATA
-# ============================================
-faq_data = [
-    {
-        "question": "About the College",
-        "answer": """
-RNS First Grade College (RNSFGC) was established in 2012 by industrialist-philanthropist Dr. R. N. Shetty.  
-It is an autonomous institution accredited by NAAC with an 'A' grade.  
-The college focuses on value-driven education, experiential learning, skill development, discipline, and holistic growth.
-"""
-    },
-    {
-        "question": "Vision and Mission",
-        "answer": """
-• Uphold academic excellence with integrity.  
-• Promote discipline, ethics, responsibility & holistic development.  
-• Bridge theory and practice through labs, projects & industry learning.  
-• Prepare students for careers via training & placements.  
-"""
-    },
-    {
-        "question": "Courses Offered",
-        "answer": """
-UG Programs: BCA, B.Com, BBA  
-PG Program: MBA
-"""
-    },
-    {
-        "question": "Departments",
-        "answer": """
-• BCA  
-• B.Com  
-• BBA  
-• MBA  
-"""
-    },
-    {
-        "question": "Facilities",
-        "answer": """
-• Computer labs  
-• Library & Digital Library  
-• Hostel  
-• Auditorium  
-• Sports (Indoor & Outdoor)  
-• ICT-enabled classrooms  
-• Canteen  
-• Gym  
-"""
-    },
-    {
-        "question": "Contact Details",
-        "answer": """
-Address:
-RNS First Grade College, Dr. Vishnuvardhan Road, RR Nagar, Bengaluru – 560098  
-
-Phone: 080-28611110, 9141095892  
-
-Emails:  
-• enquiryrnsfgc@gmail.com  
-• principal_rnsfgc@rnsgi.com  
-• vp_rnsfgc@rnsgi.com  
-• rnsfgccollege2012@gmail.com  
-"""
-    }
-]
-
-faq_text = "\n\n".join([f"Q: {i['question']}\nA: {i['answer']}" for i in faq_data])
-
-# ============================================
-# LLM ANSWERING LOGIC
-# ============================================
-client = Groq(api_key=GROQ_API_KEY)
-
-def answer_faq(question):
-    prompt = f"""
-Answer ONLY from the FAQ below.
-If information is missing, say: "I could not find this information."
-
-FAQ:
-{faq_text}
-
-QUESTION:
-{question}
-"""
-
-    res = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=300
-    )
-
-    return res.choices[0].message.content.strip()
-
-
-# ============================================
-# GRADE CALCULATOR
-# ============================================
-def calculate_multi_subject_grades(marks_dict):
-    total = sum(marks_dict.values())
-    percentage = total / len(marks_dict)
-    cgpa = percentage / 9.5
-    return total, percentage, round(cgpa, 2)
-
-
 # ============================================
 # MAIN UI
 # ============================================
@@ -172,7 +75,7 @@ tab1, tab2 = st.tabs(["📘 College FAQ Assistant", "📊 Grade Calculator"])
 # =================================================
 # TAB 1 — FAQ Assistant
 # =================================================
-with tab1:
+with tab1, rerun_timer.section("faq tab"):
 
     st.subheader("Ask anything about RNSFGC")
 
@@ -202,15 +105,23 @@ with tab1:
         if question.strip() == "":
             st.warning("Please enter a question!")
         else:
-            ans = answer_faq(question)
-            st.markdown(f'<div class="answer-box">{ans}</div>', unsafe_allow_html=True)
+            ans, confidence = faq_matcher.answer(question)
+            source = f"Answered from the FAQ (match confidence {confidence:.2f})"
+            if ans is None:
+                ans, source = answer_store.lookup("faq", question), "Precomputed answer"
+            if ans is None:
+                ans, source = model_router.faq(question), None
+            with metrics.span("render"):
+                st.markdown(f'<div class="answer-box">{ans}</div>', unsafe_allow_html=True)
+            if source:
+                st.caption(source)
 
 
 
 # =================================================
 # TAB 2 — Grade Calculator
 # =================================================
-with tab2:
+with tab2, rerun_timer.section("grades tab"):
 
     st.subheader("Enter Subject Marks")
 
@@ -240,3 +151,26 @@ with tab2:
             """,
             unsafe_allow_html=True
         )
+
+    st.subheader("Bulk Grading (CSV / Excel)")
+    bulk_file = st.file_uploader("Upload a marks sheet: one row per student, one column per subject",
+                                 type=["csv", "xlsx"], key="bulk_marks_file")
+    bulk_max = st.number_input("Maximum marks per subject:", min_value=1, value=100, key="bulk_max_marks")
+    if bulk_file is not None:
+        try:
+            marks_df = read_marks_table(bulk_file.getvalue(), bulk_file.name)
+            subjects = st.multiselect("Subject columns:", list(marks_df.select_dtypes(include="number").columns),
+                                      default=subject_columns(marks_df), key="bulk_subjects")
+            graded = grade_table(marks_df, max_marks=bulk_max, subjects=subjects)
+        except (ValueError, ImportError) as e:
+            st.warning(str(e))
+        else:
+            if (incomplete := int((graded["Grade"] == INCOMPLETE).sum())):
+                st.warning(f"{incomplete} student(s) have missing marks and were not graded (see Missing).")
+            st.dataframe(graded, width="stretch")
+            st.download_button("Download Results (CSV)", graded.to_csv(index=False).encode("utf-8"),
+                               file_name="grade_results.csv", mime="text/csv", key="bulk_grades_download")
+
+timing.render_report(st, rerun_timer)
+if metrics.admin_panel_enabled(st):
+    metrics.render_admin_panel(st)
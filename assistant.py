@@ -0,0 +1,253 @@
+# assistant.py — Chat and FAQ answering shared by the Streamlit apps and other front ends
+#
+# Everything here is built once per process on first import; Streamlit keeps
+# imported modules across reruns and sessions, so no rerun pays for it again.
+import time
+
+import metrics
+from answer_cache import answer_cache, make_namespace
+from college_data import faq_data, faq_text
+from faq_matcher import FAQMatcher
+from llm_client import LLMError, get_client, message_text
+from singleflight import LeaderAbandoned, request_key, single_flight
+
+DEFAULT_MODEL = "llama-3.1-8b-instant"
+CHAT_MAX_TOKENS = 450
+CHAT_TEMPERATURE = 0.12
+FAQ_MODEL = DEFAULT_MODEL
+FAQ_MAX_TOKENS = 300
+FAQ_CACHE_NAMESPACE = make_namespace(faq_text, model=FAQ_MODEL, max_tokens=FAQ_MAX_TOKENS)
+
+faq_matcher = FAQMatcher(faq_data)
+
+
+# ---------------------------
+# Groq wrapper
+# ---------------------------
+def groq_chat(messages, max_tokens: int = 400, temperature: float = 0.15, model: str = DEFAULT_MODEL,
+              semantic_cache: bool = True, stats: dict = None):
+    """Answer text (or a "[Groq error] ..." string); fills `stats` with cached/error/usage/total_s."""
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    # Everything before the final user turn (system prompt etc.) is part of the cache key
+    namespace = make_namespace(repr(messages[:-1]), model=model, max_tokens=max_tokens, temperature=temperature)
+    question = messages[-1]["content"]
+    cached = answer_cache.get(question, namespace, semantic=semantic_cache)
+    if cached is not None:
+        stats.update(cached=True, total_s=time.perf_counter() - start)
+        return cached
+
+    # Identical questions already in flight from other sessions share one upstream call
+    key = request_key(messages, mode="response", model=model, max_tokens=max_tokens, temperature=temperature)
+    try:
+        with metrics.span("llm_call", endpoint="chat"):
+            resp, shared = single_flight.do(key, lambda: get_client("groq").chat(
+                messages,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature
+            ))
+        answer = message_text(resp)
+    except Exception as e:
+        stats.update(cached=False, error=e, total_s=time.perf_counter() - start)
+        return f"[Groq error] {e}"
+
+    stats.update(cached=False, coalesced=shared, usage=resp.get("usage"), total_s=time.perf_counter() - start)
+    answer_cache.put(question, namespace, answer, semantic=semantic_cache)
+    return answer
+
+
+def groq_chat_stream(messages, max_tokens: int = 400, temperature: float = 0.15, model: str = DEFAULT_MODEL,
+                     semantic_cache: bool = True, stats: dict = None):
+    """Yield the answer piece by piece; fills `stats` with time-to-first-token and total time."""
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    namespace = make_namespace(repr(messages[:-1]), model=model, max_tokens=max_tokens, temperature=temperature)
+    question = messages[-1]["content"]
+    cached = answer_cache.get(question, namespace, semantic=semantic_cache)
+    if cached is not None:
+        stats.update(cached=True, ttft_s=time.perf_counter() - start, total_s=time.perf_counter() - start)
+        yield cached
+        return
+
+    stats.update(cached=False, coalesced=False, ttft_s=None, total_s=None)
+    key = request_key(messages, mode="stream", model=model, max_tokens=max_tokens, temperature=temperature)
+    while True:
+        call, leader = single_flight.begin(key)
+        if leader:
+            break
+        # Another session is already generating this answer; wait for it instead of calling Groq again
+        try:
+            answer = single_flight.wait(call)
+        except LeaderAbandoned:
+            continue  # its reader went away mid-answer: lead the next call, or wait on whoever does
+        except Exception as e:
+            answer = f"[Groq error] {e}"
+        stats["coalesced"] = True
+        stats["ttft_s"] = stats["total_s"] = time.perf_counter() - start
+        yield answer
+        return
+
+    parts = []
+    abandoned = True
+    error = LLMError("stream was abandoned before it finished")
+    try:
+        for delta in get_client("groq").stream_chat(messages, model=model, max_tokens=max_tokens, temperature=temperature):
+            if stats["ttft_s"] is None:
+                stats["ttft_s"] = time.perf_counter() - start
+            parts.append(delta)
+            yield delta
+        error, abandoned = None, False
+    except Exception as e:
+        error = stats["error"] = e
+        abandoned = False
+        metrics.record_error("llm_call", e)
+        yield f"[Groq error] {e}"
+    finally:
+        stats["total_s"] = time.perf_counter() - start
+        stats["error"] = error
+        metrics.observe("assistant_stage_seconds", stats["total_s"], stage="llm_call", endpoint="chat_stream")
+        if stats["ttft_s"] is not None:
+            metrics.observe("assistant_ttft_seconds", stats["ttft_s"], endpoint="chat_stream")
+        # Waiters only share real upstream outcomes, never this session's reader going away
+        single_flight.finish(key, call, result="".join(parts).strip(), error=error, abandoned=abandoned)
+
+    answer = "".join(parts).strip()
+    if error is None and answer:
+        answer_cache.put(question, namespace, answer, semantic=semantic_cache)
+
+
+# ---------------------------
+# FAQ answering
+# ---------------------------
+def faq_messages(question: str) -> list:
+    prompt = f"""
+Answer ONLY from the FAQ below.
+If information is missing, say: "I could not find this information."
+
+FAQ:
+{faq_text}
+
+QUESTION:
+{question}
+"""
+    return [{"role": "user", "content": prompt}]
+
+
+def _faq_namespace(model: str, max_tokens: int) -> str:
+    if model == FAQ_MODEL and max_tokens == FAQ_MAX_TOKENS:
+        return FAQ_CACHE_NAMESPACE
+    return make_namespace(faq_text, model=model, max_tokens=max_tokens)
+
+
+def answer_faq(question, model: str = FAQ_MODEL, max_tokens: int = FAQ_MAX_TOKENS, stats: dict = None):
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    namespace = _faq_namespace(model, max_tokens)
+    cached = answer_cache.get(question, namespace)
+    if cached is not None:
+        stats.update(cached=True, total_s=time.perf_counter() - start)
+        return cached
+
+    messages = faq_messages(question)
+    key = request_key(messages, mode="response", model=model, max_tokens=max_tokens)
+    with metrics.span("llm_call", endpoint="faq"):
+        res, shared = single_flight.do(key, lambda: get_client("groq").chat(
+            messages,
+            model=model,
+            max_tokens=max_tokens
+        ))
+
+    answer = message_text(res)
+    stats.update(cached=False, coalesced=shared, usage=res.get("usage"), total_s=time.perf_counter() - start)
+    answer_cache.put(question, namespace, answer)
+    return answer
+
+
+# ---------------------------
+# asyncio variants (used by api_server.py)
+# ---------------------------
+async def agroq_chat(messages, max_tokens: int = 400, temperature: float = 0.15, model: str = DEFAULT_MODEL,
+                     semantic_cache: bool = True, stats: dict = None):
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    namespace = make_namespace(repr(messages[:-1]), model=model, max_tokens=max_tokens, temperature=temperature)
+    question = messages[-1]["content"]
+    cached = answer_cache.get(question, namespace, semantic=semantic_cache)
+    if cached is not None:
+        stats.update(cached=True, total_s=time.perf_counter() - start)
+        return cached
+
+    key = request_key(messages, mode="response", model=model, max_tokens=max_tokens, temperature=temperature)
+    try:
+        with metrics.span("llm_call", endpoint="chat"):
+            resp, shared = await single_flight.ado(key, lambda: get_client("groq").achat(
+                messages, model=model, max_tokens=max_tokens, temperature=temperature))
+        answer = message_text(resp)
+    except Exception as e:
+        stats.update(cached=False, error=e, total_s=time.perf_counter() - start)
+        return f"[Groq error] {e}"
+
+    stats.update(cached=False, coalesced=shared, usage=resp.get("usage"), total_s=time.perf_counter() - start)
+    answer_cache.put(question, namespace, answer, semantic=semantic_cache)
+    return answer
+
+
+async def agroq_chat_stream(messages, max_tokens: int = 400, temperature: float = 0.15, model: str = DEFAULT_MODEL,
+                            semantic_cache: bool = True, stats: dict = None):
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    namespace = make_namespace(repr(messages[:-1]), model=model, max_tokens=max_tokens, temperature=temperature)
+    question = messages[-1]["content"]
+    cached = answer_cache.get(question, namespace, semantic=semantic_cache)
+    if cached is not None:
+        stats.update(cached=True, ttft_s=time.perf_counter() - start, total_s=time.perf_counter() - start)
+        yield cached
+        return
+
+    stats.update(cached=False, coalesced=False, ttft_s=None, total_s=None)
+    parts = []
+    error = LLMError("stream was abandoned before it finished")
+    try:
+        async for delta in get_client("groq").astream_chat(messages, model=model, max_tokens=max_tokens,
+                                                          temperature=temperature):
+            if stats["ttft_s"] is None:
+                stats["ttft_s"] = time.perf_counter() - start
+                metrics.observe("assistant_ttft_seconds", stats["ttft_s"], endpoint="chat_stream")
+            parts.append(delta)
+            yield delta
+        error = None
+    except Exception as e:
+        error = stats["error"] = e
+        metrics.record_error("llm_call", e)
+        yield f"[Groq error] {e}"
+        return
+    finally:
+        stats["total_s"] = time.perf_counter() - start
+        stats["error"] = error
+        metrics.observe("assistant_stage_seconds", stats["total_s"], stage="llm_call", endpoint="chat_stream")
+
+    answer = "".join(parts).strip()
+    if answer:
+        answer_cache.put(question, namespace, answer, semantic=semantic_cache)
+
+
+async def aanswer_faq(question, model: str = FAQ_MODEL, max_tokens: int = FAQ_MAX_TOKENS, stats: dict = None):
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+    namespace = _faq_namespace(model, max_tokens)
+    cached = answer_cache.get(question, namespace)
+    if cached is not None:
+        stats.update(cached=True, total_s=time.perf_counter() - start)
+        return cached
+
+    messages = faq_messages(question)
+    key = request_key(messages, mode="response", model=model, max_tokens=max_tokens)
+    with metrics.span("llm_call", endpoint="faq"):
+        res, shared = await single_flight.ado(key, lambda: get_client("groq").achat(
+            messages, model=model, max_tokens=max_tokens))
+
+    answer = message_text(res)
+    stats.update(cached=False, coalesced=shared, usage=res.get("usage"), total_s=time.perf_counter() - start)
+    answer_cache.put(question, namespace, answer)
+    return answer
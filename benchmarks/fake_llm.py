@@ -0,0 +1,126 @@
+# benchmarks/fake_llm.py — Local OpenAI/Groq-compatible stand-in with configurable latency and token rate
+#
+# Serves POST /v1/chat/completions (plain and SSE streaming) so benchmarks
+# exercise the real llm_client code paths without network or API keys.
+#   python -m benchmarks.fake_llm --port 8088 --latency 0.3 --tokens-per-s 150
+# then set config.LLM_BASE_URLS = {"groq": "http://127.0.0.1:8088/v1"}.
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), latency_s: float = 0.2, tokens_per_s: float = 200.0,
+                 completion_tokens: int = 120, rate_limit_every: int = 0, error_status: int = 429,
+                 retry_after: str = "0.1", drop_stream_after: int = 0):
+        super().__init__(address, _Handler)
+        self.latency_s = latency_s                # before the first token / the whole response
+        self.tokens_per_s = tokens_per_s          # generation speed after the first token
+        self.completion_tokens = completion_tokens
+        self.rate_limit_every = rate_limit_every  # every Nth request gets error_status (0 = never)
+        self.error_status = error_status
+        self.retry_after = retry_after            # Retry-After sent with the error ("" = none)
+        self.drop_stream_after = drop_stream_after  # cut streams off after this many tokens (0 = never)
+        self._counter = itertools.count(1)
+        self.requests = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def next_request(self) -> int:
+        self.requests = next(self._counter)
+        return self.requests
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # otherwise delayed ACKs add ~40 ms to every response
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chunk(self, data: bytes):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        number = server.next_request()
+        if server.rate_limit_every and number % server.rate_limit_every == 0:
+            headers = {"Retry-After": server.retry_after} if server.retry_after else {}
+            self._send_json(server.error_status, {"error": {"message": "rate limited"}}, headers)
+            return
+
+        n_tokens = min(server.completion_tokens, payload.get("max_tokens") or server.completion_tokens)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in payload.get("messages", [])) // 4
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": n_tokens,
+                 "total_tokens": prompt_tokens + n_tokens}
+        per_token = 1.0 / server.tokens_per_s if server.tokens_per_s > 0 else 0.0
+        time.sleep(server.latency_s)
+
+        if not payload.get("stream"):
+            time.sleep(n_tokens * per_token)
+            text = " ".join(f"tok{i}" for i in range(n_tokens))
+            self._send_json(200, {"id": f"fake-{number}", "object": "chat.completion", "model": payload.get("model"),
+                                  "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                                               "finish_reason": "stop"}],
+                                  "usage": usage})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        start = time.perf_counter()
+        for i in range(n_tokens):
+            # Pace against the wall clock so per-write overhead does not slow the stream down
+            delay = start + i * per_token - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if server.drop_stream_after and i == server.drop_stream_after:
+                self.close_connection = True  # connection lost mid-answer: no [DONE], no final chunk
+                return
+            event = {"choices": [{"index": 0, "delta": {"content": f"tok{i} "}}]}
+            self._chunk(f"data: {json.dumps(event)}\n\n".encode())
+        self._chunk(f"data: {json.dumps({'choices': [], 'usage': usage})}\n\n".encode())
+        self._chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def start_server(port: int = 0, **options) -> FakeLLMServer:
+    """Start a server on a background thread; `options` are FakeLLMServer settings."""
+    server = FakeLLMServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible chat server.")
+    parser.add_argument("--port", type=int, default=8088)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--tokens-per-s", type=float, default=200.0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with 429")
+    args = parser.parse_args()
+    srv = FakeLLMServer(("127.0.0.1", args.port), latency_s=args.latency, tokens_per_s=args.tokens_per_s,
+                        completion_tokens=args.completion_tokens, rate_limit_every=args.rate_limit_every)
+    print(f"Fake LLM listening on {srv.base_url}")
+    srv.serve_forever()
@@ -0,0 +1,58 @@
+# benchmarks/harness.py — Timing, percentile summaries and wiring the app to the fake LLM
+import math
+import time
+
+import config
+
+
+def percentile(sorted_samples: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q in 0..100)."""
+    if not sorted_samples:
+        return float("nan")
+    rank = max(1, math.ceil(q / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(name: str, samples: list, wall_s: float = None, **extra) -> dict:
+    """Latency summary in milliseconds, plus throughput (ops/s) over `wall_s` if given."""
+    ordered = sorted(samples)
+    wall_s = wall_s if wall_s is not None else sum(samples)
+    result = {
+        "name": name,
+        "n": len(samples),
+        "mean_ms": sum(samples) / len(samples) * 1000 if samples else float("nan"),
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "min_ms": ordered[0] * 1000 if ordered else float("nan"),
+        "max_ms": ordered[-1] * 1000 if ordered else float("nan"),
+        "throughput_per_s": len(samples) / wall_s if wall_s else float("nan"),
+    }
+    result.update(extra)
+    return result
+
+
+def measure(name: str, fn, repeat: int = 20, warmup: int = 2, setup=None, **extra) -> dict:
+    """Call fn() `repeat` times (after `warmup` untimed calls); setup(), if given, runs untimed before each."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(name, samples, **extra)
+
+
+def skipped(name: str, reason) -> dict:
+    return {"name": name, "skipped": str(reason)}
+
+
+def use_fake_llm(server):
+    """Point every provider at the fake server; must run before the first llm_client.get_client()."""
+    config.LLM_BASE_URLS = {"groq": server.base_url, "openai": server.base_url}
+    config.GROQ_API_KEY = config.OPENAI_API_KEY = "benchmark"
@@ -0,0 +1,74 @@
+# benchmarks/ingest.py — Ingestion throughput at growing corpus sizes
+#
+# The corpus is N copies of college_info.txt under distinct file names, so every
+# copy yields its own chunks (ids hash the source path).
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.harness import skipped
+
+DEFAULT_SIZES = (1, 10, 100)
+SOURCE = "college_info.txt"
+
+
+def make_corpus(directory: str, copies: int) -> int:
+    """Write `copies` files into directory; returns total bytes."""
+    with open(SOURCE, "rb") as f:
+        data = f.read()
+    for i in range(copies):
+        with open(os.path.join(directory, f"college_info_{i:05d}.txt"), "wb") as f:
+            f.write(data)
+    return len(data) * copies
+
+
+def _rates(name: str, copies: int, corpus_bytes: int, chunks: int, seconds: float, **extra) -> dict:
+    return {"name": name, "files": copies, "chunks": chunks, "seconds": seconds,
+            "files_per_s": copies / seconds, "chunks_per_s": chunks / seconds,
+            "mb_per_s": corpus_bytes / seconds / 1e6, **extra}
+
+
+def bench_size(copies: int, workers: int = None, embed: bool = True) -> list:
+    from load_data import iter_unique_chunks
+
+    root = tempfile.mkdtemp(prefix="bench_ingest_")
+    corpus = os.path.join(root, "corpus")
+    os.makedirs(corpus)
+    try:
+        corpus_bytes = make_corpus(corpus, copies)
+
+        start = time.perf_counter()
+        chunks = sum(1 for _ in iter_unique_chunks([corpus], workers=workers))
+        results = [_rates(f"ingest.chunk[{copies} files]", copies, corpus_bytes, chunks,
+                          time.perf_counter() - start, workers=workers)]
+        if not embed:
+            return results
+
+        try:
+            from load_data import load_documents
+
+            persist = os.path.join(root, "db")
+            start = time.perf_counter()
+            stats = load_documents([corpus], persist_directory=persist, workers=workers)
+            results.append(_rates(f"ingest.load_documents[{copies} files]", copies, corpus_bytes, stats["added"],
+                                  time.perf_counter() - start, workers=workers))
+            start = time.perf_counter()
+            stats = load_documents([corpus], persist_directory=persist, workers=workers)
+            results.append(_rates(f"ingest.load_documents[{copies} files, unchanged]", copies, corpus_bytes,
+                                  stats["skipped"], time.perf_counter() - start, workers=workers))
+        except ImportError as e:
+            results.append(skipped(f"ingest.load_documents[{copies} files]", e))
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def run(sizes=DEFAULT_SIZES, workers: int = None, embed: bool = True) -> list:
+    import chunker
+
+    chunker.count_tokens("warm up")  # load the tokenizer outside the timed runs
+    results = []
+    for copies in sizes:
+        results.extend(bench_size(copies, workers=workers, embed=embed))
+    return results
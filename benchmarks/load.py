@@ -0,0 +1,85 @@
+# benchmarks/load.py — Concurrent-session load generator driving the Streamlit scripts with AppTest
+#
+# Each simulated session is its own AppTest (own session state), run on its own
+# thread, so the shared per-process pieces (LLM client pool, answer cache,
+# single-flight, indexes) are exercised the way concurrent browser sessions do.
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.harness import summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# script, question input key, submit button key
+SCENARIOS = {
+    "chat": ("app.py", "chat_q_input", "ask_groq_btn"),
+    "faq": ("app_streamlit.py", "main_question_box", "faq_button"),
+}
+
+QUESTIONS = [
+    "What courses are offered?",
+    "Is hostel available?",
+    "How can I contact the principal?",
+    "What facilities does the campus have?",
+    "Which departments are there?",
+    "What is the college's mission?",
+    "Does the college have a library?",
+    "Tell me about the BCA program.",
+]
+
+
+def _session(scenario: str, requests: int, session_no: int, unique: bool, timeout: float) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    script, input_key, button_key = SCENARIOS[scenario]
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    page_load = time.perf_counter() - start
+
+    latencies, errors = [], 0
+    questions = itertools.islice(itertools.cycle(QUESTIONS), session_no, None)
+    for i, question in zip(range(requests), questions):
+        if unique:
+            question = f"{question} (session {session_no}, request {i})"
+        at.text_input(key=input_key).input(question)
+        at.button(key=button_key).click()
+        start = time.perf_counter()
+        try:
+            at.run()
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+        errors += bool(at.exception)
+    return {"page_load": page_load, "latencies": latencies, "errors": errors}
+
+
+def run(scenario: str = "chat", sessions: int = 8, requests: int = 5, unique: bool = False,
+        timeout: float = 120.0) -> list:
+    """Run `sessions` concurrent sessions of `requests` questions each; latency is one full rerun."""
+    from streamlit import config as st_config
+
+    # Magic rewrites each script with ast, which is not thread-safe on Python 3.11; the apps do not use it
+    st_config.set_option("runner.magicEnabled", False)
+    started = threading.Barrier(sessions)
+
+    def worker(n):
+        started.wait()
+        return _session(scenario, requests, n, unique, timeout)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        outcomes = list(pool.map(worker, range(sessions)))
+    wall = time.perf_counter() - wall_start
+
+    latencies = [s for o in outcomes for s in o["latencies"]]
+    errors = sum(o["errors"] for o in outcomes)
+    label = f"load.{scenario}[{sessions} sessions x {requests}{', unique' if unique else ''}]"
+    return [
+        summarize(f"{label} page load", [o["page_load"] for o in outcomes], wall_s=wall),
+        summarize(f"{label} question", latencies, wall_s=wall, errors=errors, sessions=sessions),
+    ]
@@ -0,0 +1,144 @@
+# benchmarks/micro.py — Per-function microbenchmarks for the paths the apps run
+import itertools
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.harness import measure, skipped, summarize
+
+QUESTIONS = [
+    "What courses does RNSFGC offer?",
+    "Is there a hostel on campus?",
+    "What is the phone number of the college?",
+    "Tell me about the computer labs.",
+    "When was the college established?",
+]
+
+
+def _unique(counter=itertools.count()):
+    # A fresh question every call, so the answer cache cannot serve it
+    return f"{QUESTIONS[0]} (run {next(counter)})"
+
+
+def bench_grades(repeat: int) -> list:
+    from grading import calculate_multi_subject_grades, compute_grades
+
+    rng = np.random.default_rng(0)
+    marks = rng.integers(0, 101, size=10_000)
+    subjects = {f"Subject {i}": int(m) for i, m in enumerate(rng.integers(30, 101, size=6))}
+    return [
+        measure("grading.compute_grades[10k]", lambda: compute_grades(marks), repeat=repeat),
+        measure("grading.calculate_multi_subject_grades[6]", lambda: calculate_multi_subject_grades(subjects),
+                repeat=repeat),
+    ]
+
+
+def bench_pdf(repeat: int) -> list:
+    from pdf_export import generate_pdf_bytes
+
+    plan = "\n".join(f"Day {d}: revise chapter {d}, solve ten problems, then a 25 minute recap." for d in range(1, 60))
+    return [measure("pdf_export.generate_pdf_bytes[60 lines]", lambda: generate_pdf_bytes("Study Plan", plan),
+                    repeat=repeat)]
+
+
+def bench_local_matching(repeat: int) -> list:
+    from assistant import faq_matcher
+    from chunker import chunk_text
+    from prompt_builder import prompt_builder
+
+    with open("college_info.txt", encoding="utf-8") as f:
+        corpus = f.read()
+    questions = itertools.cycle(QUESTIONS)
+    return [
+        measure("faq_matcher.answer", lambda: faq_matcher.answer(next(questions)), repeat=repeat * 5),
+        measure("prompt_builder.build", lambda: prompt_builder.build(next(questions)), repeat=repeat * 5),
+        measure("chunker.chunk_text[college_info]", lambda: chunk_text(corpus), repeat=repeat),
+    ]
+
+
+def bench_llm(repeat: int) -> list:
+    from answer_cache import answer_cache
+    from assistant import answer_faq, groq_chat, groq_chat_stream
+    from college_data import SYSTEM_PROMPT
+
+    def chat(question):
+        return groq_chat([{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": question}],
+                         semantic_cache=False)
+
+    ttfts, totals = [], []
+
+    def stream():
+        stats = {}
+        start = time.perf_counter()
+        for _ in groq_chat_stream([{"role": "system", "content": SYSTEM_PROMPT},
+                                   {"role": "user", "content": _unique()}], semantic_cache=False, stats=stats):
+            pass
+        totals.append(time.perf_counter() - start)
+        ttfts.append(stats["ttft_s"])
+
+    stream()  # warm-up: connection setup
+    ttfts.clear()
+    totals.clear()
+    for _ in range(repeat):
+        stream()
+    return [
+        measure("assistant.groq_chat[miss]", lambda: chat(_unique()), repeat=repeat, warmup=1,
+                setup=answer_cache.clear),
+        measure("assistant.groq_chat[cache hit]", lambda: chat(QUESTIONS[1]), repeat=repeat * 5),
+        summarize("assistant.groq_chat_stream[ttft]", ttfts),
+        summarize("assistant.groq_chat_stream[total]", totals),
+        measure("assistant.answer_faq[miss]", lambda: answer_faq(_unique()), repeat=repeat, warmup=1,
+                setup=answer_cache.clear),
+        measure("assistant.answer_faq[cache hit]", lambda: answer_faq(QUESTIONS[2]), repeat=repeat * 5),
+    ]
+
+
+def bench_retrieval(repeat: int) -> list:
+    """Needs the embedding model and Chroma; builds a throwaway index from college_info.txt."""
+    try:
+        import rag_engine
+        from load_data import load_documents
+    except ImportError as e:
+        return [skipped("rag_engine.search", e)]
+
+    persist = tempfile.mkdtemp(prefix="bench_rag_")
+    try:
+        try:
+            load_documents(["college_info.txt"], persist_directory=persist, workers=1)
+            retriever = rag_engine.Retriever(persist_directory=persist)
+        except ImportError as e:
+            return [skipped("rag_engine.search", e)]
+        questions = itertools.cycle(QUESTIONS)
+        results = [
+            measure("rag_engine.Retriever.search[cached embedding]", lambda: retriever.search(next(questions)),
+                    repeat=repeat * 5),
+            measure("rag_engine.Retriever.search[new query]", lambda: retriever.search(_unique()), repeat=repeat),
+        ]
+        rag_engine._retriever = retriever
+        results.append(measure("rag_engine.ask_agent", lambda: rag_engine.ask_agent(_unique()), repeat=repeat,
+                               warmup=1))
+        return results
+    finally:
+        rag_engine._retriever = None
+        shutil.rmtree(persist, ignore_errors=True)
+
+
+SUITES = {
+    "grades": bench_grades,
+    "pdf": bench_pdf,
+    "local": bench_local_matching,
+    "llm": bench_llm,
+    "retrieval": bench_retrieval,
+}
+
+
+def run(repeat: int = 20, suites=None) -> list:
+    results = []
+    for name in suites or SUITES:
+        try:
+            results.extend(SUITES[name](repeat))
+        except ImportError as e:
+            results.append(skipped(name, e))
+    return results
@@ -0,0 +1,134 @@
+# benchmarks/run.py — Run the benchmark suites against a local fake LLM and write JSON results
+#
+#   python -m benchmarks.run                                  # everything, default settings
+#   python -m benchmarks.run --suite micro --repeat 50 --output before.json
+#   python -m benchmarks.run --suite load --scenario faq --sessions 32 --requests 10 --unique
+#   python -m benchmarks.run --compare before.json after.json # p50/p95 deltas between two runs
+#
+# Benchmarks whose optional dependencies (embedding model, Chroma, Streamlit)
+# are missing are recorded as skipped rather than failing the run.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_table(results: list):
+    for r in results:
+        if "skipped" in r:
+            print(f"{r['name']:<58} skipped: {r['skipped']}")
+        elif "p50_ms" in r:
+            print(f"{r['name']:<58} p50 {r['p50_ms']:9.2f} ms  p95 {r['p95_ms']:9.2f} ms  "
+                  f"p99 {r['p99_ms']:9.2f} ms  {r['throughput_per_s']:9.1f}/s")
+        else:
+            print(f"{r['name']:<58} {r['chunks_per_s']:9.1f} chunks/s  {r['mb_per_s']:7.3f} MB/s  "
+                  f"({r['seconds']:.2f} s)")
+
+
+def compare(before_path: str, after_path: str):
+    with open(before_path, encoding="utf-8") as f:
+        before = {r["name"]: r for r in json.load(f)["results"]}
+    with open(after_path, encoding="utf-8") as f:
+        after = json.load(f)["results"]
+    for r in after:
+        old = before.get(r["name"])
+        if old is None or "skipped" in r or "skipped" in old:
+            continue
+        for field in ("p50_ms", "p95_ms", "chunks_per_s"):
+            if field in r and field in old and old[field]:
+                change = (r[field] - old[field]) / old[field] * 100
+                print(f"{r['name']:<58} {field:<13} {old[field]:10.2f} -> {r[field]:10.2f} ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the assistant against a local fake LLM.")
+    parser.add_argument("--suite", action="append", choices=["micro", "ingest", "load"],
+                        help="suite to run (repeatable; default: all)")
+    parser.add_argument("--micro", action="append", help="micro benchmark groups (default: all)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake LLM seconds before the first token")
+    parser.add_argument("--tokens-per-s", type=float, default=200.0, help="fake LLM generation speed")
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="fake LLM answers every Nth call with 429")
+    parser.add_argument("--sizes", type=int, nargs="+", default=None, help="ingest corpus sizes in files")
+    parser.add_argument("--no-embed", action="store_true", help="ingest: measure chunking only")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--scenario", choices=["chat", "faq"], default="chat")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--unique", action="store_true", help="load: make every question a cache miss")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import config
+    from benchmarks import fake_llm, harness
+
+    server = fake_llm.start_server(latency_s=args.latency, tokens_per_s=args.tokens_per_s,
+                                   completion_tokens=args.completion_tokens, rate_limit_every=args.rate_limit_every)
+    harness.use_fake_llm(server)
+    scratch = tempfile.mkdtemp(prefix="bench_")
+    config.STUDENT_DB_PATH = os.path.join(scratch, "student_data.db")
+
+    suites = args.suite or ["micro", "ingest", "load"]
+    results = []
+    started = time.time()
+    if "micro" in suites:
+        from benchmarks import micro
+        results += micro.run(repeat=args.repeat, suites=args.micro)
+    if "ingest" in suites:
+        from benchmarks import ingest
+        results += ingest.run(sizes=args.sizes or ingest.DEFAULT_SIZES, workers=args.workers,
+                              embed=not args.no_embed)
+    if "load" in suites:
+        try:
+            from benchmarks import load
+            results += load.run(args.scenario, sessions=args.sessions, requests=args.requests, unique=args.unique)
+        except ImportError as e:
+            results.append(harness.skipped(f"load.{args.scenario}", e))
+
+    report = {
+        "meta": {
+            "started": started,
+            "duration_s": time.time() - started,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "fake_llm": {"latency_s": args.latency, "tokens_per_s": args.tokens_per_s,
+                         "completion_tokens": args.completion_tokens, "rate_limit_every": args.rate_limit_every,
+                         "requests_served": server.requests},
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_table(results)
+    print(f"Wrote {args.output}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# chat_memory.py — Bounded multi-turn memory: recent turns verbatim, older ones as a rolling summary
+import config
+import metrics
+from assistant import groq_chat
+from prompt_builder import estimate_tokens
+
+MEMORY_TOKEN_BUDGET = 1200   # history sent with each question (config.CHAT_MEMORY_TOKENS overrides)
+MIN_RECENT_TURNS = 1         # always kept verbatim, however long
+SUMMARY_MAX_TOKENS = 150
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a student and the RNSFGC assistant.
+Keep facts, names, numbers and what the student is trying to find out; drop pleasantries.
+Reply with the new summary only, at most {words} words.
+
+CURRENT SUMMARY:
+{summary}
+
+NEW TURNS:
+{turns}"""
+
+
+class ChatMemory:
+    """Conversation history for one session, kept under a token budget.
+
+    When the verbatim turns push the history over budget, the oldest are folded
+    into a rolling summary with one small LLM call, so prompt size stays bounded
+    however long the conversation runs.
+    """
+
+    def __init__(self, token_budget: int = None, min_recent_turns: int = MIN_RECENT_TURNS):
+        self.token_budget = token_budget or getattr(config, "CHAT_MEMORY_TOKENS", MEMORY_TOKEN_BUDGET)
+        self.min_recent_turns = min_recent_turns
+        self.summary = ""
+        self.turns = []          # [(question, answer)], oldest first
+
+    def __len__(self):
+        return len(self.turns)
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(estimate_tokens(q) + estimate_tokens(a) for q, a in self.turns)
+
+    def context_query(self, question: str) -> str:
+        """Question plus the previous one, so follow-ups ("what about its fees?") find the right sections."""
+        return f"{self.turns[-1][0]} {question}" if self.turns else question
+
+    def messages(self, system_prompt: str, question: str) -> list:
+        messages = [{"role": "system", "content": system_prompt}]
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        for q, a in self.turns:
+            messages.append({"role": "user", "content": q})
+            messages.append({"role": "assistant", "content": a})
+        messages.append({"role": "user", "content": question})
+        return messages
+
+    def add(self, question: str, answer: str):
+        if answer.startswith("[Groq error]"):
+            return
+        self.turns.append((question, answer))
+        if self.tokens() > self.token_budget:
+            self.compact()
+
+    def compact(self):
+        """Fold the oldest turns into the summary until the history fits the budget."""
+        folded = []
+        while len(self.turns) > self.min_recent_turns and self.tokens() > self.token_budget:
+            folded.append(self.turns.pop(0))
+        if not folded:
+            return
+        turns = "\n".join(f"Student: {q}\nAssistant: {a}" for q, a in folded)
+        prompt = SUMMARY_PROMPT.format(words=SUMMARY_MAX_TOKENS * 3 // 4, summary=self.summary or "(none)",
+                                       turns=turns)
+        with metrics.span("memory_compaction"):
+            summary = groq_chat([{"role": "user", "content": prompt}], max_tokens=SUMMARY_MAX_TOKENS,
+                                temperature=0.0, semantic_cache=False)
+        if summary.startswith("[Groq error]"):
+            # Keep at least the questions so follow-ups still have something to go on
+            summary = " ".join(filter(None, [self.summary, "Earlier questions: " + "; ".join(q for q, _ in folded)]))
+            summary = summary[-SUMMARY_MAX_TOKENS * 4:]
+        self.summary = summary.strip()
+        metrics.inc("assistant_memory_compactions_total")
+
+    def clear(self):
+        self.summary = ""
+        self.turns = []
@@ -0,0 +1,162 @@
+# chunker.py — Structure-aware chunking: split on headings and list items, size by tokens
+#
+# Replaces the fixed 500-character / 100-overlap splitter. Each chunk stays
+# inside one section, starts with that section's title, and carries it as
+# metadata, so chunks need no overlap to keep their context.
+import re
+
+from timing import lazy_import
+
+CHUNK_TOKENS = 200          # MiniLM truncates at 256 word pieces; leave room for the title
+TOKENIZER_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+MAX_HEADING_WORDS = 8
+BOILERPLATE_MIN_PAGES = 3   # fewer pages than this and a repeated line is not clearly a header
+BOILERPLATE_SHARE = 0.6
+
+LIST_ITEM_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+MARKDOWN_HEADING_RE = re.compile(r"^#{1,6}\s+(.*?)\s*#*$")
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+_tokenizer = None
+
+
+def count_tokens(text: str) -> int:
+    """Word-piece count under the embedding model's tokenizer (≈ chars/4 if it is unavailable)."""
+    global _tokenizer
+    if _tokenizer is None:
+        try:
+            _tokenizer = lazy_import("transformers").AutoTokenizer.from_pretrained(TOKENIZER_MODEL)
+        except (ImportError, OSError):
+            _tokenizer = False
+    if _tokenizer is False:
+        return max(1, len(text) // 4)
+    return len(_tokenizer.tokenize(text))
+
+
+def heading_text(line: str, prev_blank: bool, next_line: str):
+    """Return the heading if `line` looks like one, else None."""
+    line = line.strip()
+    m = MARKDOWN_HEADING_RE.match(line)
+    if m:
+        return m.group(1)
+    if not line or not prev_blank or LIST_ITEM_RE.match(line):
+        return None
+    if not _heading_shaped(line):
+        return None
+    if next_line.strip() and not _heading_shaped(next_line):
+        return None
+    return line
+
+
+def _heading_shaped(line: str) -> bool:
+    line = line.strip()
+    return bool(MARKDOWN_HEADING_RE.match(line)) or (
+        bool(line) and len(line.split()) <= MAX_HEADING_WORDS and line[-1] not in ".,;:!?"
+        and line[0].isupper() and ": " not in line and not LIST_ITEM_RE.match(line))
+
+
+def iter_blocks(text: str, section: str = ""):
+    """Yield (section, block) pairs: blank-line paragraphs and single list items under their heading."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    block, prev_blank, after_heading = [], True, False
+    for i, line in enumerate(lines):
+        next_line = lines[i + 1] if i + 1 < len(lines) else ""
+        title = heading_text(line, prev_blank, next_line)
+        if title is not None:
+            if block:
+                yield section, "\n".join(block)
+                block = []
+            # A heading directly under another (document title, then first section) keeps both
+            section = f"{section} › {title}" if after_heading and section else title
+            prev_blank = after_heading = True
+            continue
+        if line.strip():
+            after_heading = False
+        if not line.strip():
+            if block:
+                yield section, "\n".join(block)
+                block = []
+            prev_blank = True
+            continue
+        if LIST_ITEM_RE.match(line) and block:
+            yield section, "\n".join(block)
+            block = []
+        block.append(line.rstrip())
+        prev_blank = False
+    if block:
+        yield section, "\n".join(block)
+
+
+def _split_oversized(block: str, max_tokens: int):
+    """Break a block longer than max_tokens at sentence, then word, boundaries."""
+    pieces, current = [], ""
+    for unit in SENTENCE_RE.split(block):
+        words = [unit] if count_tokens(unit) <= max_tokens else unit.split()
+        for word in words:
+            candidate = f"{current} {word}".strip()
+            if current and count_tokens(candidate) > max_tokens:
+                pieces.append(current)
+                candidate = word
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _boilerplate_key(line: str) -> str:
+    # Page numbers differ from page to page ("Page 3 of 9"), so digits are ignored
+    return " ".join(re.findall(r"[^\W\d]+", line.lower()))
+
+
+def strip_repeated_lines(pages: list, min_pages: int = BOILERPLATE_MIN_PAGES,
+                         min_share: float = BOILERPLATE_SHARE) -> list:
+    """Drop running headers/footers: lines found on at least `min_share` of a file's pages."""
+    if len(pages) < min_pages:
+        return pages
+    counts = {}
+    for page in pages:
+        for key in {_boilerplate_key(line) for line in page.splitlines()}:
+            if key:
+                counts[key] = counts.get(key, 0) + 1
+    repeated = {key for key, n in counts.items() if n >= min_share * len(pages)}
+    if not repeated:
+        return pages
+    return ["\n".join(line for line in page.splitlines() if _boilerplate_key(line) not in repeated)
+            for page in pages]
+
+
+def chunk_text(text: str, max_tokens: int = CHUNK_TOKENS, section: str = ""):
+    """Split text into [(chunk, section)] without overlap, at most max_tokens each.
+
+    Blocks are packed greedily within a section; a new heading always starts a
+    new chunk. Repeated text is kept: identical list items under different
+    entries are real content. Page headers/footers are removed per file by
+    strip_repeated_lines() before chunking.
+    `section` is the heading in force at the start of text, e.g. from the previous page.
+    """
+    chunks = []
+    current, current_section, used = [], section, 0
+
+    def flush():
+        if current:
+            body = "\n\n".join(current)
+            if current_section and not body.startswith(current_section):
+                body = f"{current_section}\n{body}"
+            chunks.append((body, current_section))
+
+    for block_section, block in iter_blocks(text, section):
+        if not re.search(r"\w", block):
+            continue
+        if block_section != current_section:
+            flush()
+            current, current_section, used = [], block_section, count_tokens(block_section)
+        budget = max_tokens - count_tokens(current_section)
+        for piece in [block] if count_tokens(block) <= budget else _split_oversized(block, budget):
+            size = count_tokens(piece)
+            if current and used + size > max_tokens:
+                flush()
+                current, used = [], count_tokens(current_section)
+            current.append(piece)
+            used += size
+    flush()
+    return chunks
@@ -0,0 +1,125 @@
+# college_data.py — RNSFGC reference data, split into addressable sections
+
+# (key, title, text). Texts are the lines of the official information block.
+OFFICIAL_SECTIONS = [
+    ("overview", "Overview", """- Established: 2012.
+- Founder: Industrialist-philanthropist Dr. R. N. Shetty.
+- Status: Autonomous (recently converted to autonomous status).
+- Accreditation: NAAC accredited with an 'A' grade."""),
+    ("mission", "Focus & Mission", """- Educational focus: Value-driven education, experiential learning, skill development, discipline, and holistic student growth.
+- Mission highlights: Maintain academic excellence with integrity; promote holistic personal development; bridge theory & practice via labs, projects, and industry-relevant curriculum; prepare students for careers with training and placements; nurture socially aware, value-based, culturally rooted individuals."""),
+    ("courses", "Courses", """- Courses / Programs:
+  • UG: Bachelor of Computer Applications (BCA), Bachelor of Commerce (B.Com), Bachelor of Business Administration (BBA)
+  • PG: Master of Business Administration (MBA)"""),
+    ("departments", "Departments", """- Departments: Computer Applications (BCA), Commerce (B.Com), Management (BBA), MBA department."""),
+    ("facilities", "Facilities", """- Facilities: Well-equipped computer labs & IT infrastructure, library & digital library, hostel accommodation, auditorium/seminar halls, sports & recreation facilities (outdoor & indoor), canteen/food court, ICT-enabled classrooms / smart classrooms, fitness & wellness facilities."""),
+    ("contact", "Contact & Location", """- Contact & Location:
+  RNS First Grade College, Dr. Vishnuvardhan Road, Channasandra, RR Nagar, Bengaluru – 560098
+  Phone: 080-28611110 / 9141095892
+  Emails: enquiryrnsfgc@gmail.com, principal_rnsfgc@rnsgi.com, vp_rnsfgc@rnsgi.com, rnsfgccollege2012@gmail.com"""),
+]
+
+COLLEGE_OFFICIAL = (
+    "\nRNS First Grade College (RNSFGC) — Official Information\n"
+    + "\n".join(text for _, _, text in OFFICIAL_SECTIONS)
+    + "\n"
+)
+
+COLLEGE_BROCHURE = """
+RNS First Grade College — Professional Brochure Summary
+RNSFGC is a modern, autonomous institution committed to shaping well-rounded professionals through a blend of rigorous academics and practical exposure. The college emphasizes:
+• Academic excellence and ethical conduct
+• Industry-relevant training and hands-on learning
+• Leadership, communication, and personal growth
+Programs include BCA, B.Com, BBA at the undergraduate level and MBA at the postgraduate level. Campus life supports learning through advanced computer labs, a comprehensive library (digital + physical), sports and cultural activities, smart classrooms, auditoriums for seminars, and residential facilities for outstation students. RNSFGC prepares students for contemporary careers with placement-oriented programs, value-based education, and opportunities for experiential projects.
+"""
+
+PROMPT_HEADER = """
+You are an AI assistant specialized for RNS First Grade College (RNSFGC), Bengaluru.
+Use the official details and brochure below to answer student queries accurately.
+"""
+
+PROMPT_GUIDELINES = """
+Guidelines:
+- Always prefer factual accuracy using OFFICIAL INFO for facts (courses, contact, accreditation, departments, facilities, year, founder).
+- For promotional or brochure-style responses use BROCHURE text.
+- Keep answers concise, structured; use bullets/lists where helpful.
+- If the answer is not present in the provided info, reply exactly: "I could not find this information in the college data I was given."
+- Avoid inventing facts. Be professional and student-friendly.
+"""
+
+SYSTEM_PROMPT = f"""{PROMPT_HEADER}
+--- OFFICIAL INFO (use this for factual answers) ---
+{COLLEGE_OFFICIAL}
+
+--- PROFESSIONAL BROCHURE SUMMARY (use for polished descriptions) ---
+{COLLEGE_BROCHURE}
+{PROMPT_GUIDELINES}"""
+
+
+# Canned FAQ shown by app_streamlit.py; also answered locally by faq_matcher
+faq_data = [
+    {
+        "question": "About the College",
+        "answer": """
+RNS First Grade College (RNSFGC) was established in 2012 by industrialist-philanthropist Dr. R. N. Shetty.  
+It is an autonomous institution accredited by NAAC with an 'A' grade.  
+The college focuses on value-driven education, experiential learning, skill development, discipline, and holistic growth.
+"""
+    },
+    {
+        "question": "Vision and Mission",
+        "answer": """
+• Uphold academic excellence with integrity.  
+• Promote discipline, ethics, responsibility & holistic development.  
+• Bridge theory and practice through labs, projects & industry learning.  
+• Prepare students for careers via training & placements.  
+"""
+    },
+    {
+        "question": "Courses Offered",
+        "answer": """
+UG Programs: BCA, B.Com, BBA  
+PG Program: MBA
+"""
+    },
+    {
+        "question": "Departments",
+        "answer": """
+• BCA  
+• B.Com  
+• BBA  
+• MBA  
+"""
+    },
+    {
+        "question": "Facilities",
+        "answer": """
+• Computer labs  
+• Library & Digital Library  
+• Hostel  
+• Auditorium  
+• Sports (Indoor & Outdoor)  
+• ICT-enabled classrooms  
+• Canteen  
+• Gym  
+"""
+    },
+    {
+        "question": "Contact Details",
+        "answer": """
+Address:
+RNS First Grade College, Dr. Vishnuvardhan Road, RR Nagar, Bengaluru – 560098  
+
+Phone: 080-28611110, 9141095892  
+
+Emails:  
+• enquiryrnsfgc@gmail.com  
+• principal_rnsfgc@rnsgi.com  
+• vp_rnsfgc@rnsgi.com  
+• rnsfgccollege2012@gmail.com  
+"""
+    }
+]
+
+faq_text = "\n\n".join([f"Q: {i['question']}\nA: {i['answer']}" for i in faq_data])
@@ -1 +1,14 @@
 GROQ_API_KEY = "YOUR_API_KEY_HERE"
+OPENAI_API_KEY = "YOUR_API_KEY_HERE"
+
+# Optional: point a provider at another OpenAI-compatible endpoint, e.g. a local fake server
+# LLM_BASE_URLS = {"groq": "http://127.0.0.1:8088/v1"}
+
+# Show the metrics panel in the Streamlit sidebar (also available with ?admin=1)
+SHOW_ADMIN_PANEL = False
+
+# Vector store used by rag_engine: "chroma" (python load_data.py) or "mmap" (python load_data.py --backend mmap)
+VECTOR_BACKEND = "chroma"
+
+# Optional cross-encoder to rerank hybrid RAG results, e.g. "cross-encoder/ms-marco-MiniLM-L-6-v2"
+RAG_RERANKER = None
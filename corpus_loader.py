@@ -0,0 +1,130 @@
+# corpus_loader.py — Stream text chunks out of a directory tree of .txt/.md/.pdf/.docx files
+#
+# Files are extracted and split in a process pool, but only a small window of
+# files is in flight at once, so memory stays bounded however large the corpus.
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import chunker
+import metrics
+from timing import lazy_import
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".txt", ".md", ".pdf", ".docx")
+DOCX_SEGMENT_CHARS = 10_000
+
+
+def iter_files(root: str, extensions=SUPPORTED_EXTENSIONS):
+    """Yield matching file paths under root (or root itself if it is a file), in a stable order."""
+    if os.path.isfile(root):
+        if root.lower().endswith(extensions):
+            yield root
+        return
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_files(entry.path, extensions)
+        elif entry.name.lower().endswith(extensions):
+            yield entry.path
+
+
+# ---------------------------
+# Extraction (runs in worker processes)
+# ---------------------------
+def _read_text_file(path: str) -> str:
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return data.decode("utf-16")
+    return data.decode("utf-8-sig", errors="replace")
+
+
+def iter_segments(path: str):
+    """Yield (text, extra metadata) per page/section of one file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".txt", ".md"):
+        yield _read_text_file(path), {}
+    elif ext == ".pdf":
+        reader = lazy_import("pypdf").PdfReader(path)
+        for number, page in enumerate(reader.pages, 1):
+            text = page.extract_text() or ""
+            if text.strip():
+                yield text, {"page": number}
+    elif ext == ".docx":
+        document = lazy_import("docx").Document(path)
+        buffer, size = [], 0
+        for paragraph in document.paragraphs:
+            # Heading styles become markdown headings so the chunker sees the structure
+            is_heading = paragraph.style is not None and paragraph.style.name.startswith(("Heading", "Title"))
+            buffer.append(f"# {paragraph.text}" if is_heading and paragraph.text.strip() else paragraph.text)
+            size += len(paragraph.text)
+            if size >= DOCX_SEGMENT_CHARS:
+                yield "\n".join(buffer), {}
+                buffer, size = [], 0
+        if buffer:
+            yield "\n".join(buffer), {}
+
+
+def _split_file(path: str) -> tuple:
+    """(chunks, skip reason); the reason is None, "missing_dependency" or "unreadable"."""
+    chunks, section = [], ""
+    try:
+        segments = list(iter_segments(path))
+        # Running headers/footers are found across the whole file, not page by page
+        texts = chunker.strip_repeated_lines([text for text, _ in segments])
+        for text, (_, extra) in zip(texts, segments):
+            # The heading in force at the end of one page carries over to the next
+            for piece, section in chunker.chunk_text(text, section=section):
+                metadata = {"source": path, **extra}
+                if section:
+                    metadata["section"] = section
+                chunks.append((piece, metadata))
+    except ImportError as e:
+        logger.warning("Skipping %s: %s", path, e)
+        return [], "missing_dependency"
+    except Exception as e:  # a corrupt file should not stop the whole ingest
+        logger.warning("Skipping %s: %s: %s", path, type(e).__name__, e)
+        return [], "unreadable"
+    return chunks, None
+
+
+def _documents(result: tuple, Document):
+    # Counted here, in the parent process, where the metrics registry is exported
+    chunks, skipped = result
+    if skipped:
+        metrics.inc("assistant_ingest_skipped_total", reason=skipped)
+    for text, metadata in chunks:
+        yield Document(page_content=text, metadata=metadata)
+
+
+# ---------------------------
+# Streaming entry point
+# ---------------------------
+def iter_chunks(paths, workers: int = None, max_in_flight: int = None):
+    """Lazily yield langchain Documents for every supported file under `paths`."""
+    Document = lazy_import("langchain_core.documents").Document
+    if isinstance(paths, str):
+        paths = [paths]
+    files = (f for root in paths for f in iter_files(root))
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 2
+
+    if workers == 1:
+        for path in files:
+            yield from _documents(_split_file(path), Document)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for path in files:
+            pending.append(pool.submit(_split_file, path))
+            if len(pending) >= max_in_flight:
+                yield from _documents(pending.popleft().result(), Document)
+        while pending:
+            yield from _documents(pending.popleft().result(), Document)
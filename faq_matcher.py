@@ -0,0 +1,60 @@
+# faq_matcher.py — Answer canned FAQ questions locally, without an LLM round trip
+import metrics
+from text_search import BM25Index, build_synonym_map, tokenize
+
+DIRECT_ANSWER_CONFIDENCE = 0.75
+
+# Canonical term first; every alias is folded onto it before indexing and lookup.
+FAQ_SYNONYMS = {
+    "course": ["program", "programme", "degree", "ug", "pg", "offered"],
+    "facility": ["amenity", "infrastructure", "campus", "lab", "library", "hostel", "gym", "canteen", "sport"],
+    "contact": ["phone", "email", "mail", "address", "location", "call", "reach", "number"],
+    "college": ["rnsfgc", "institution", "institute", "overview"],
+    "mission": ["vision", "value", "goal", "motto"],
+    "department": ["dept", "branch", "stream"],
+}
+
+
+class FAQMatcher:
+    def __init__(self, faq_data, synonyms: dict = None):
+        self.faq_data = list(faq_data)
+        self.synonyms = build_synonym_map(FAQ_SYNONYMS if synonyms is None else synonyms)
+        self._exact = {" ".join(self._tokens(item["question"])): i for i, item in enumerate(self.faq_data)}
+        self._question_tokens = [set(self._tokens(item["question"])) for item in self.faq_data]
+        # Questions are repeated so a title hit outweighs a passing mention in an answer
+        docs = [self._tokens(item["question"]) * 3 + self._tokens(item["answer"]) for item in self.faq_data]
+        self.index = BM25Index(docs)
+
+    def _tokens(self, text: str) -> list:
+        return tokenize(text, self.synonyms)
+
+    def match(self, question: str):
+        """Return (faq item, confidence in [0, 1]) for the best entry, or (None, 0.0)."""
+        tokens = self._tokens(question)
+        if not tokens:
+            return None, 0.0
+
+        exact = self._exact.get(" ".join(tokens))
+        if exact is not None:
+            return self.faq_data[exact], 1.0
+
+        ranked = self.index.top_k(tokens, k=2)
+        if not ranked:
+            return None, 0.0
+        best_idx, best_score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        query_terms = set(tokens)
+        coverage = len(query_terms & self._question_tokens[best_idx]) / len(query_terms)
+        margin = (best_score - runner_up) / best_score if best_score else 0.0
+        confidence = round(0.7 * coverage + 0.3 * margin, 3)
+        return self.faq_data[best_idx], confidence
+
+    def answer(self, question: str, min_confidence: float = DIRECT_ANSWER_CONFIDENCE):
+        """Return (answer, confidence) when the match is confident enough, else (None, confidence)."""
+        item, confidence = self.match(question)
+        if item is None or confidence < min_confidence:
+            metrics.cache_result("faq_matcher", False)
+            return None, confidence
+        metrics.cache_result("faq_matcher", True)
+        return item["answer"].strip(), confidence
@@ -0,0 +1,97 @@
+# grading.py — Shared grade calculation, vectorised over whole classes with NumPy
+import io
+import re
+
+import numpy as np
+
+# Lower bounds (percent) of each band; GRADE_LABELS has one more entry for "below the first cutoff"
+GRADE_CUTOFFS = np.array([50, 60, 70, 80, 90], dtype=np.float64)
+GRADE_LABELS = np.array(["Fail", "C", "B", "B+", "A", "A+"])
+CGPA_DIVISOR = 9.5
+INCOMPLETE = "Incomplete"
+# Numeric columns with these words in their name identify students rather than hold marks
+ID_COLUMN_WORDS = {"id", "roll", "usn", "reg", "regno", "registration", "serial", "sl", "sno", "no", "admission",
+                   "phone", "mobile", "year", "batch", "section"}
+
+
+def grade_bands(percentages) -> np.ndarray:
+    """Map percentages to grade labels with one searchsorted pass."""
+    return GRADE_LABELS[np.searchsorted(GRADE_CUTOFFS, np.asarray(percentages, dtype=np.float64), side="right")]
+
+
+def compute_grades(marks, max_marks=100) -> dict:
+    """Grade a students x subjects matrix in a single pass.
+
+    `max_marks` is a scalar or one value per subject. Returns arrays keyed
+    total, possible, percentage, cgpa and grade, one entry per student.
+    """
+    marks = np.atleast_2d(np.asarray(marks, dtype=np.float64))
+    max_marks = np.broadcast_to(np.asarray(max_marks, dtype=np.float64), (marks.shape[1],))
+    total = marks.sum(axis=1)
+    possible = float(max_marks.sum())
+    percentage = total / possible * 100 if possible else np.zeros_like(total)
+    return {
+        "total": total,
+        "possible": np.full_like(total, possible),
+        "percentage": percentage,
+        "cgpa": percentage / CGPA_DIVISOR,
+        "grade": grade_bands(percentage),
+    }
+
+
+def calculate_multi_subject_grades(marks_dict, max_marks=100):
+    """Single-student helper used by the widget calculators: (total, percentage, cgpa)."""
+    values = list(marks_dict.values())
+    result = compute_grades([values], max_marks)
+    return sum(values), float(result["percentage"][0]), round(float(result["cgpa"][0]), 2)
+
+
+# ---------------------------
+# Bulk grading from CSV / Excel
+# ---------------------------
+def read_marks_table(data: bytes, filename: str):
+    """Load an uploaded marks sheet: one row per student, one numeric column per subject."""
+    import pandas as pd
+
+    name = filename.lower()
+    if name.endswith(".xls"):
+        # Legacy Excel needs xlrd, which is not a dependency
+        raise ValueError("Old .xls files are not supported; save the sheet as .xlsx or .csv.")
+    if name.endswith(".xlsx"):
+        return pd.read_excel(io.BytesIO(data))
+    return pd.read_csv(io.BytesIO(data))
+
+
+def subject_columns(df) -> list:
+    """Numeric columns that look like marks; ID-like ones (Roll No, USN, Student ID) are left out."""
+    return [col for col in df.select_dtypes(include="number").columns
+            if not ID_COLUMN_WORDS.intersection(re.findall(r"[a-z]+", str(col).lower()))]
+
+
+def grade_table(df, max_marks=100, subjects=None):
+    """Append Total/Percentage/CGPA/Grade columns for the `subjects` columns (default: subject_columns()).
+
+    Students with a missing mark are not graded: their Grade is "Incomplete",
+    their totals are empty and a Missing column names the subjects.
+    """
+    subject_cols = list(subjects) if subjects is not None else subject_columns(df)
+    if not subject_cols:
+        raise ValueError("No numeric subject columns found in the uploaded sheet.")
+    non_numeric = [c for c in subject_cols if c not in set(df.select_dtypes(include="number").columns)]
+    if non_numeric:
+        raise ValueError(f"Subject columns must hold numbers: {', '.join(map(str, non_numeric))}")
+
+    marks = df[subject_cols]
+    missing = marks.isna().to_numpy()
+    incomplete = missing.any(axis=1)
+    result = compute_grades(marks.fillna(0).to_numpy(), max_marks)
+    out = df.copy()
+    out["Total"] = np.where(incomplete, np.nan, result["total"])
+    out["Percentage"] = np.where(incomplete, np.nan, result["percentage"].round(2))
+    out["CGPA"] = np.where(incomplete, np.nan, result["cgpa"].round(2))
+    out["Grade"] = np.where(incomplete, INCOMPLETE, result["grade"])
+    if incomplete.any():
+        names = np.array([str(c) for c in subject_cols])
+        out["Missing"] = [", ".join(names[row]) for row in missing]
+    out.attrs["subjects"] = subject_cols
+    return out
@@ -0,0 +1,262 @@
+# llm_client.py — Shared OpenAI-compatible chat client (Groq, OpenAI, local fakes)
+import asyncio
+import email.utils
+import json
+import random
+import threading
+import time
+
+import config
+import metrics
+from timing import lazy_import
+
+PROVIDERS = {
+    "groq": {"base_url": "https://api.groq.com/openai/v1", "key_setting": "GROQ_API_KEY"},
+    "openai": {"base_url": "https://api.openai.com/v1", "key_setting": "OPENAI_API_KEY"},
+}
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+RATE_LIMIT_COOLDOWN = 30.0  # seconds a model counts as rate-limited after a 429 without Retry-After
+
+
+class LLMError(Exception):
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+def _retry_after(response) -> float:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), or None."""
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None  # malformed header: fall back to plain backoff
+    return max(parsed.timestamp() - time.time(), 0.0) if parsed else None
+
+
+_DONE = object()
+
+
+def _sse_event(line: str):
+    """Parse one server-sent-events line: an event dict, _DONE, or None for non-data lines."""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    return _DONE if data == "[DONE]" else json.loads(data)
+
+
+def _delta_text(event: dict) -> str:
+    choices = event.get("choices") or []
+    return (choices[0].get("delta") or {}).get("content") or "" if choices else ""
+
+
+def _stream_usage(event: dict):
+    # OpenAI puts usage on the final chunk; Groq nests it under x_groq
+    return event.get("usage") or (event.get("x_groq") or {}).get("usage")
+
+
+def message_text(response: dict) -> str:
+    return response["choices"][0]["message"]["content"].strip()
+
+
+class LLMClient:
+    """Pooled HTTP client with a concurrency cap and jittered, Retry-After aware retries."""
+
+    def __init__(self, base_url: str, api_key: str, max_concurrency: int = 16, max_retries: int = 4,
+                 timeout: float = 60.0, backoff_base: float = 0.5, backoff_max: float = 8.0):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sync_client = None
+        self._sync_lock = threading.Lock()
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency)
+        self._async_state = {}  # event loop -> (AsyncClient, Semaphore)
+        self._rate_limited = {}  # model -> monotonic time its last 429 stops counting
+
+    # ---------------------------
+    # Plumbing
+    # ---------------------------
+    def _client(self):
+        if self._sync_client is None:
+            with self._sync_lock:
+                if self._sync_client is None:
+                    httpx = lazy_import("httpx")
+                    self._sync_client = httpx.Client(base_url=self.base_url, headers=self.headers,
+                                                     timeout=self.timeout, limits=self._limits())
+        return self._sync_client
+
+    def _async(self):
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            client = lazy_import("httpx").AsyncClient(base_url=self.base_url, headers=self.headers,
+                                                      timeout=self.timeout, limits=self._limits())
+            state = self._async_state[loop] = (client, asyncio.Semaphore(self.max_concurrency))
+        return state
+
+    def _limits(self):
+        return lazy_import("httpx").Limits(max_connections=self.max_concurrency,
+                                           max_keepalive_connections=self.max_concurrency)
+
+    def _backoff(self, attempt: int, response=None, model: str = None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        requested = _retry_after(response)
+        if model and response is not None and response.status_code == 429:
+            self._rate_limited[model] = time.monotonic() + (requested or RATE_LIMIT_COOLDOWN)
+        return max(delay, requested) if requested is not None else delay
+
+    @staticmethod
+    def _payload(messages, model, max_tokens, temperature, stream, extra) -> dict:
+        payload = {"model": model, "messages": messages, "max_tokens": max_tokens,
+                   "temperature": temperature, **extra}
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    @staticmethod
+    def _error(response) -> LLMError:
+        return LLMError(f"HTTP {response.status_code}: {response.text[:300]}", status=response.status_code)
+
+    def rate_limited(self, model: str) -> bool:
+        """Whether `model` answered 429 recently (within its Retry-After, or RATE_LIMIT_COOLDOWN)."""
+        return self._rate_limited.get(model, 0.0) > time.monotonic()
+
+    # ---------------------------
+    # Sync entry points
+    # ---------------------------
+    def chat(self, messages, model: str, max_tokens: int = 400, temperature: float = 0.15, **extra) -> dict:
+        httpx = lazy_import("httpx")
+        payload = self._payload(messages, model, max_tokens, temperature, False, extra)
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                with self._sync_slots:
+                    response = self._client().post("/chat/completions", json=payload)
+                if response.status_code < 400:
+                    data = response.json()
+                    metrics.record_usage(data.get("usage"), model)
+                    return data
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise self._error(response)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise LLMError(f"{type(e).__name__}: {e}") from e
+            metrics.inc("assistant_llm_retries_total", status=response.status_code if response is not None else "transport")
+            time.sleep(self._backoff(attempt, response, model))
+
+    def stream_chat(self, messages, model: str, max_tokens: int = 400, temperature: float = 0.15, **extra):
+        """Yield content deltas. Retries happen only before the first delta is yielded."""
+        httpx = lazy_import("httpx")
+        payload = self._payload(messages, model, max_tokens, temperature, True, extra)
+        started = False  # once a delta has gone out, a retry would repeat the answer
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                with self._sync_slots, self._client().stream("POST", "/chat/completions", json=payload) as response:
+                    if response.status_code < 400:
+                        for line in response.iter_lines():
+                            event = _sse_event(line)
+                            if event is _DONE:
+                                return
+                            if event:
+                                metrics.record_usage(_stream_usage(event), model)
+                                if _delta_text(event):
+                                    started = True
+                                    yield _delta_text(event)
+                        return
+                    response.read()
+                    if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                        raise self._error(response)
+            except httpx.TransportError as e:
+                if started or attempt == self.max_retries:
+                    raise LLMError(f"{type(e).__name__}: {e}") from e
+            metrics.inc("assistant_llm_retries_total", status=response.status_code if response is not None else "transport")
+            time.sleep(self._backoff(attempt, response, model))
+
+    # ---------------------------
+    # asyncio entry points
+    # ---------------------------
+    async def achat(self, messages, model: str, max_tokens: int = 400, temperature: float = 0.15, **extra) -> dict:
+        httpx = lazy_import("httpx")
+        payload = self._payload(messages, model, max_tokens, temperature, False, extra)
+        client, slots = self._async()
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                async with slots:
+                    response = await client.post("/chat/completions", json=payload)
+                if response.status_code < 400:
+                    data = response.json()
+                    metrics.record_usage(data.get("usage"), model)
+                    return data
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise self._error(response)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise LLMError(f"{type(e).__name__}: {e}") from e
+            metrics.inc("assistant_llm_retries_total", status=response.status_code if response is not None else "transport")
+            await asyncio.sleep(self._backoff(attempt, response, model))
+
+    async def astream_chat(self, messages, model: str, max_tokens: int = 400, temperature: float = 0.15, **extra):
+        httpx = lazy_import("httpx")
+        payload = self._payload(messages, model, max_tokens, temperature, True, extra)
+        client, slots = self._async()
+        started = False  # once a delta has gone out, a retry would repeat the answer
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                async with slots, client.stream("POST", "/chat/completions", json=payload) as response:
+                    if response.status_code < 400:
+                        async for line in response.aiter_lines():
+                            event = _sse_event(line)
+                            if event is _DONE:
+                                return
+                            if event:
+                                metrics.record_usage(_stream_usage(event), model)
+                                if _delta_text(event):
+                                    started = True
+                                    yield _delta_text(event)
+                        return
+                    await response.aread()
+                    if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                        raise self._error(response)
+            except httpx.TransportError as e:
+                if started or attempt == self.max_retries:
+                    raise LLMError(f"{type(e).__name__}: {e}") from e
+            metrics.inc("assistant_llm_retries_total", status=response.status_code if response is not None else "transport")
+            await asyncio.sleep(self._backoff(attempt, response, model))
+
+    def close(self):
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider: str = "groq") -> LLMClient:
+    """Process-wide client per provider; base URLs can be overridden in config.LLM_BASE_URLS."""
+    client = _clients.get(provider)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                spec = PROVIDERS[provider]
+                base_url = getattr(config, "LLM_BASE_URLS", {}).get(provider, spec["base_url"])
+                client = _clients[provider] = LLMClient(base_url, getattr(config, spec["key_setting"], ""))
+    return client
@@ -1,29 +1,135 @@
-from langchain_community.document_loaders import TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
+import argparse
+import hashlib
+import json
+import os
 
+from timing import lazy_import
 
-def load_documents():
-    loader = TextLoader("college_info.txt", encoding="utf-8")
-    docs = loader.load()
+DB_DIR = "college_db"
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_SOURCES = ["college_info.txt", "dashboard.pdf"]
+INGEST_BATCH_SIZE = 256
+INDEX_META_FILE = "index_meta.json"
+MANIFEST_FILE = "manifest.json"
+MMAP_INDEX_DIR = os.path.join(DB_DIR, "mmap")
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-    chunks = splitter.split_documents(docs)
 
-    print("Chunks created:", len(chunks))
+def write_index_meta(persist_directory: str = DB_DIR, **meta):
+    # Record how the index was built so the query side embeds with the same model
+    os.makedirs(persist_directory, exist_ok=True)
+    with open(os.path.join(persist_directory, INDEX_META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
 
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
 
-    vector_db = Chroma.from_documents(
-        chunks,
-        embeddings,
-        persist_directory="college_db"
-    )
+def read_index_meta(persist_directory: str = DB_DIR) -> dict:
+    path = os.path.join(persist_directory, INDEX_META_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest: dict, persist_directory: str = DB_DIR):
+    # chunk id -> source, for inspecting an index; load_documents trusts the store's own ids
+    os.makedirs(persist_directory, exist_ok=True)
+    tmp_path = os.path.join(persist_directory, MANIFEST_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(persist_directory, MANIFEST_FILE))
+
+
+def chunk_id(chunk) -> str:
+    # The id is the content hash, so an unchanged chunk keeps its id across runs
+    source = chunk.metadata.get("source", "")
+    return hashlib.sha256(f"{source}\x00{chunk.page_content}".encode("utf-8")).hexdigest()
+
+
+def iter_unique_chunks(paths=None, workers: int = None):
+    """Yield (chunk_id, chunk) for every file/directory in `paths`, duplicates dropped, streaming."""
+    import corpus_loader
+
+    seen = set()
+    for chunk in corpus_loader.iter_chunks(paths or DEFAULT_SOURCES, workers=workers):
+        cid = chunk_id(chunk)
+        if cid not in seen:
+            seen.add(cid)
+            yield cid, chunk
+
+
+def load_documents(paths=None, persist_directory: str = DB_DIR, workers: int = None,
+                   batch_size: int = INGEST_BATCH_SIZE) -> dict:
+    # langchain and sentence-transformers are only imported when ingestion actually runs
+    HuggingFaceEmbeddings = lazy_import("langchain_huggingface").HuggingFaceEmbeddings
+    Chroma = lazy_import("langchain_community.vectorstores").Chroma
+
+    meta = read_index_meta(persist_directory)
+    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+    vector_db = Chroma(persist_directory=persist_directory, embedding_function=embeddings)
+
+    # What is already indexed comes from the store itself, not the manifest: an
+    # index built before content-hash ids (random UUIDs, no manifest) or one whose
+    # manifest was lost would otherwise get every chunk added a second time.
+    stored = set(vector_db.get(include=[])["ids"])
+    if stored and meta.get("embedding_model") != EMBEDDING_MODEL:
+        # Vectors from another (or an unrecorded) model are not comparable; start over
+        vector_db.delete(ids=list(stored))
+        stored = set()
+
+    # Chunks stream in from the corpus loader and are embedded batch by batch;
+    # only ids and source names are kept for the whole run.
+    current, batch, added = {}, [], 0
+    for cid, chunk in iter_unique_chunks(paths, workers):
+        current[cid] = chunk.metadata.get("source", "")
+        if cid in stored:
+            continue
+        batch.append((cid, chunk))
+        if len(batch) >= batch_size:
+            vector_db.add_documents([c for _, c in batch], ids=[i for i, _ in batch])
+            added += len(batch)
+            batch = []
+    if batch:
+        vector_db.add_documents([c for _, c in batch], ids=[i for i, _ in batch])
+        added += len(batch)
+
+    print("Chunks created:", len(current))
+
+    stale_ids = [i for i in stored if i not in current]
+    if stale_ids:
+        vector_db.delete(ids=stale_ids)
 
     vector_db.persist()
+    write_manifest(current, persist_directory)
+    write_index_meta(persist_directory, embedding_model=EMBEDDING_MODEL)
+
+    stats = {"added": added, "skipped": len(current) - added, "removed": len(stale_ids)}
+    print(f"Added: {stats['added']}, skipped: {stats['skipped']}, removed: {stats['removed']}")
     print("Data loaded successfully!")
+    return stats
+
+
+def build_mmap_index(paths=None, index_dir: str = MMAP_INDEX_DIR, dtype: str = "float16",
+                     batch_size: int = 64, workers: int = None) -> dict:
+    """Compact memory-mapped alternative to Chroma (see vector_index.py); unchanged chunks are reused."""
+    import vector_index
+
+    docs = [(i, chunk.page_content, chunk.metadata) for i, chunk in iter_unique_chunks(paths, workers)]
+    print("Chunks created:", len(docs))
+    stats = vector_index.build_index(docs, index_dir, EMBEDDING_MODEL, dtype=dtype,
+                                     batch_size=batch_size, workers=workers)
+    print(f"Embedded: {stats['embedded']}, reused: {stats['reused']}, vector bytes: {stats['bytes']}")
+    return stats
 
 
 if __name__ == "__main__":
-    load_documents()
+    parser = argparse.ArgumentParser(description="Ingest college documents into the vector index")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_SOURCES,
+                        help="files or directories (.txt, .md, .pdf, .docx); default: college_info.txt dashboard.pdf")
+    parser.add_argument("--backend", choices=["chroma", "mmap"], default="chroma")
+    parser.add_argument("--dtype", choices=["float16", "int8"], default="float16", help="mmap backend only")
+    parser.add_argument("--batch-size", type=int, default=64, help="mmap backend only")
+    parser.add_argument("--workers", type=int, default=None, help="extraction/embedding processes")
+    args = parser.parse_args()
+    if args.backend == "mmap":
+        build_mmap_index(args.paths, dtype=args.dtype, batch_size=args.batch_size, workers=args.workers)
+    else:
+        load_documents(args.paths, workers=args.workers)
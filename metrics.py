@@ -0,0 +1,174 @@
+# metrics.py — In-process counters, latency histograms and Prometheus text export
+#
+# One registry per process. Under `api_server.py --workers N` each worker keeps
+# its own numbers, so scrape every worker (or run one worker per pod).
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> float
+_histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+_help = {}
+
+
+def _key(name: str, labels: dict):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def describe(name: str, text: str):
+    _help[name] = text
+
+
+def inc(name: str, amount: float = 1.0, **labels):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + amount
+
+
+def observe(name: str, value: float, **labels):
+    key = _key(name, labels)
+    with _lock:
+        state = _histograms.get(key)
+        if state is None:
+            state = _histograms[key] = [0] * len(DEFAULT_BUCKETS) + [0.0, 0]
+        idx = bisect.bisect_left(DEFAULT_BUCKETS, value)
+        if idx < len(DEFAULT_BUCKETS):
+            state[idx] += 1
+        state[-2] += value
+        state[-1] += 1
+
+
+def record_error(stage: str, error: BaseException):
+    inc("assistant_errors_total", stage=stage, type=type(error).__name__)
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """Time a request stage into assistant_stage_seconds; exceptions are counted and re-raised."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        if not isinstance(e, GeneratorExit):
+            record_error(stage, e)
+        raise
+    finally:
+        observe("assistant_stage_seconds", time.perf_counter() - start, stage=stage, **labels)
+
+
+def record_usage(usage: dict, model: str):
+    """Token counts from an OpenAI-compatible `usage` object."""
+    if not usage:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = usage.get(f"{kind}_tokens")
+        if tokens:
+            inc("assistant_llm_tokens_total", tokens, kind=kind, model=model)
+
+
+def cache_result(cache: str, hit: bool, **labels):
+    inc("assistant_cache_requests_total", cache=cache, result="hit" if hit else "miss", **labels)
+
+
+# ---------------------------
+# Reading / export
+# ---------------------------
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labels, extra=()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (f'{k}="{_escape(v)}"' for k, v in items)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus() -> str:
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+    lines, seen = [], set()
+    for (name, labels), value in sorted(counters.items()):
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+    for (name, labels), state in sorted(histograms.items()):
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(DEFAULT_BUCKETS, state):
+            cumulative += count
+            lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', repr(bound))])} {cumulative}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {state[-1]}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_value(state[-2])}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {state[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def histogram_summary() -> list:
+    """Rows of {metric, labels, count, mean_ms, p95_ms (bucket upper bound)} for display."""
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+    rows = []
+    for (name, labels), state in sorted(histograms.items()):
+        count = state[-1]
+        target, cumulative, p95 = 0.95 * count, 0, None
+        for bound, bucket in zip(DEFAULT_BUCKETS, state):
+            cumulative += bucket
+            if cumulative >= target:
+                p95 = bound
+                break
+        rows.append({
+            "metric": name,
+            "labels": ", ".join(f"{k}={v}" for k, v in labels),
+            "count": count,
+            "mean_ms": round(state[-2] / count * 1000, 2) if count else 0.0,
+            "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+        })
+    return rows
+
+
+def counter_rows() -> list:
+    with _lock:
+        counters = dict(_counters)
+    return [{"metric": name, "labels": ", ".join(f"{k}={v}" for k, v in labels), "value": value}
+            for (name, labels), value in sorted(counters.items())]
+
+
+def render_admin_panel(st):
+    """Optional sidebar panel; `st` is the streamlit module."""
+    with st.sidebar.expander("📈 Metrics (admin)"):
+        st.dataframe(histogram_summary(), width="stretch", hide_index=True)
+        st.dataframe(counter_rows(), width="stretch", hide_index=True)
+        st.code(render_prometheus(), language="text")
+
+
+def admin_panel_enabled(st) -> bool:
+    import config
+
+    return bool(getattr(config, "SHOW_ADMIN_PANEL", False)) or st.query_params.get("admin") == "1"
+
+
+describe("assistant_stage_seconds", "Latency of each request stage in seconds.")
+describe("assistant_errors_total", "Errors by stage and exception type.")
+describe("assistant_llm_tokens_total", "Prompt and completion tokens reported by the LLM API.")
+describe("assistant_cache_requests_total", "Cache lookups by cache and result.")
+describe("assistant_llm_retries_total", "Upstream LLM retries by HTTP status.")
+describe("assistant_coalesced_requests_total", "Requests served by waiting on an identical in-flight call.")
+describe("assistant_ingest_skipped_total", "Corpus files skipped during ingest, by reason.")
@@ -0,0 +1,296 @@
+# model_router.py — Pick model and max_tokens per request class, with SLO / rate-limit fallback
+#
+# Requests are classified locally (no LLM call) as a factual lookup, a
+# descriptive answer or a generated plan. Each class has a route in
+# ROUTES (config.MODEL_ROUTES overrides entries) naming its model, token budget,
+# latency SLO and a faster fallback model. While the primary model is
+# rate-limited, or its recent p95 latency is over the SLO, the route sends
+# traffic to the fallback for a cooldown, then tries the primary again.
+import threading
+import time
+from collections import deque
+
+import config
+import metrics
+from assistant import aanswer_faq, agroq_chat, agroq_chat_stream, answer_faq, groq_chat, groq_chat_stream
+from llm_client import get_client
+from prompt_builder import estimate_tokens
+from text_search import WORD_RE
+
+FAST_MODEL = "llama-3.1-8b-instant"
+
+ROUTES = {
+    "factual": {"model": FAST_MODEL, "fallback": None, "max_tokens": 150, "slo_s": 2.0},
+    "descriptive": {"model": FAST_MODEL, "fallback": None, "max_tokens": 450, "slo_s": 6.0},
+    "plan": {"model": "llama-3.3-70b-versatile", "fallback": FAST_MODEL, "max_tokens": 800, "slo_s": 15.0},
+}
+ROUTE_FIELDS = {"model", "fallback", "max_tokens", "slo_s"}
+SLO_WINDOW = 20         # recent primary-model latencies kept per route
+SLO_MIN_SAMPLES = 5
+DEGRADED_SECONDS = 60.0
+
+PLAN_NOUNS = {"plan", "plans", "schedule", "timetable", "roadmap", "pomodoro", "routine", "strategy"}
+GENERATE_VERBS = {"create", "make", "write", "generate", "design", "draft", "build", "suggest", "give", "prepare"}
+DESCRIBE_VERBS = {"describe", "explain", "tell", "list", "elaborate", "compare", "discuss", "overview"}
+FACT_WORDS = {"phone", "email", "contact", "address", "number", "fee", "fees", "when", "where", "who", "which",
+              "date", "established", "located", "location", "website", "timing", "timings", "name", "principal"}
+WH_OPENERS = {"who", "when", "where", "which"}
+AUX_OPENERS = {"is", "are", "does", "do", "can", "has", "have"}
+FACTUAL_MAX_WORDS = 12
+
+
+def classify(question: str) -> str:
+    """'factual', 'descriptive' or 'plan' from the wording alone; microseconds, no model call.
+
+    A plan needs both a generate verb and a plan noun ("make me a revision
+    timetable"); a yes/no opener ("Can you ...") only signals a short fact when
+    no describe verb follows it.
+    """
+    words = WORD_RE.findall(question.lower())
+    if not words:
+        return "factual"
+    if PLAN_NOUNS.intersection(words) and GENERATE_VERBS.intersection(words):
+        return "plan"
+    opener = words[0] in WH_OPENERS or (words[0] in AUX_OPENERS and not DESCRIBE_VERBS.intersection(words))
+    if len(words) <= FACTUAL_MAX_WORDS and (FACT_WORDS.intersection(words) or opener
+                                            or words[:2] in (["how", "many"], ["how", "much"])):
+        return "factual"
+    return "descriptive"
+
+
+class _RouteHealth:
+    def __init__(self):
+        self.latencies = deque(maxlen=SLO_WINDOW)
+        self.degraded_until = 0.0
+
+
+class ModelRouter:
+    def __init__(self, routes: dict = None):
+        self.routes = {name: dict(route) for name, route in (routes or ROUTES).items()}
+        for name, override in getattr(config, "MODEL_ROUTES", {}).items():
+            unknown = set(override) - ROUTE_FIELDS
+            if unknown:
+                raise ValueError(f"MODEL_ROUTES[{name!r}]: unknown fields {sorted(unknown)}")
+            self.routes.setdefault(name, {"fallback": None}).update(override)
+        for name, route in self.routes.items():
+            required = {"model", "max_tokens"} | ({"slo_s"} if route.get("fallback") else set())
+            if missing := required - set(route):
+                raise ValueError(f"MODEL_ROUTES[{name!r}]: missing {sorted(missing)}")
+        self._health = {name: _RouteHealth() for name in self.routes}
+        self._lock = threading.Lock()
+
+    # ---------------------------
+    # Routing decisions
+    # ---------------------------
+    @staticmethod
+    def faq_kind(question: str) -> str:
+        """FAQ answers are never plans: the FAQ prompt has no room for one."""
+        kind = classify(question)
+        return "descriptive" if kind == "plan" else kind
+
+    def pick(self, question: str, kind: str = None) -> tuple:
+        """(route name, model, max_tokens, reason) where reason is None, 'slo' or 'rate_limit'."""
+        name = kind or classify(question)
+        route = self.routes[name]
+        model, fallback = route["model"], route.get("fallback")
+        reason = None
+        if fallback and fallback != model:
+            if get_client("groq").rate_limited(model):
+                reason = "rate_limit"
+            elif self._health[name].degraded_until > time.monotonic():
+                reason = "slo"
+        if reason:
+            metrics.inc("assistant_route_fallbacks_total", route=name, reason=reason)
+            model = fallback
+        return name, model, route["max_tokens"], reason
+
+    def _route(self, question: str, kind: str, model: str) -> tuple:
+        """(route name, model, max_tokens, pinned): pick(), unless the caller pinned the model."""
+        if model is None:
+            name, model, budget, _ = self.pick(question, kind)
+            return name, model, budget, False
+        name = kind or classify(question)
+        return name, model, self.routes[name]["max_tokens"], True
+
+    def _p95(self, samples) -> float:
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def record(self, name: str, model: str, stats: dict, prompt: str = "", answer: str = ""):
+        """Per-route latency/tokens, and SLO tracking for the route's primary model."""
+        error = stats.get("error")
+        result = "cached" if stats.get("cached") else "error" if error else "ok"
+        metrics.inc("assistant_route_requests_total", route=name, model=model, result=result)
+        if result != "ok":
+            return
+        metrics.observe("assistant_route_seconds", stats["total_s"], route=name, model=model)
+        if not stats.get("coalesced"):
+            usage = stats.get("usage") or {"prompt_tokens": estimate_tokens(prompt),
+                                           "completion_tokens": estimate_tokens(answer)}
+            for kind in ("prompt", "completion"):
+                metrics.inc("assistant_route_tokens_total", usage.get(f"{kind}_tokens") or 0, route=name,
+                            model=model, kind=kind)
+
+        route = self.routes[name]
+        if model != route["model"] or not route.get("fallback"):
+            return
+        health = self._health[name]
+        with self._lock:
+            health.latencies.append(stats["total_s"])
+            if len(health.latencies) >= SLO_MIN_SAMPLES and self._p95(health.latencies) > route["slo_s"]:
+                # Give the primary a rest, then start measuring it afresh
+                health.degraded_until = time.monotonic() + DEGRADED_SECONDS
+                health.latencies.clear()
+
+    @staticmethod
+    def _rate_limited_error(stats: dict) -> bool:
+        return getattr(stats.get("error"), "status", None) == 429
+
+    def _fallback_after_429(self, name: str, model: str, stats: dict, pinned: bool = False):
+        """The route's fallback model if the call on `model` ended in a 429, else None."""
+        fallback = self.routes[name].get("fallback")
+        if pinned or not (self._rate_limited_error(stats) and fallback and model != fallback):
+            return None
+        # The primary ran out of retries on 429s; one more try on the fallback's separate quota
+        metrics.inc("assistant_route_fallbacks_total", route=name, reason="rate_limit")
+        stats.clear()
+        return fallback
+
+    # ---------------------------
+    # Routed calls
+    # ---------------------------
+    def chat(self, messages, temperature: float = 0.15, kind: str = None, model: str = None,
+             max_tokens: int = None, semantic_cache: bool = True, stats: dict = None):
+        """groq_chat on the routed model; `model` and `max_tokens` pin either choice (e.g. per plan section)."""
+        name, model, budget, pinned = self._route(messages[-1]["content"], kind, model)
+        stats = {} if stats is None else stats
+        answer = groq_chat(messages, max_tokens=max_tokens or budget, temperature=temperature, model=model,
+                           semantic_cache=semantic_cache, stats=stats)
+        self.record(name, model, stats, repr(messages), answer)
+        fallback = self._fallback_after_429(name, model, stats, pinned)
+        if fallback:
+            model = fallback
+            answer = groq_chat(messages, max_tokens=max_tokens or budget, temperature=temperature, model=model,
+                               semantic_cache=semantic_cache, stats=stats)
+            self.record(name, model, stats, repr(messages), answer)
+        stats.update(route=name, model=model)
+        return answer
+
+    def chat_stream(self, messages, temperature: float = 0.15, kind: str = None, model: str = None,
+                    max_tokens: int = None, semantic_cache: bool = True, stats: dict = None):
+        """groq_chat_stream on the routed model; a 429 before any text is retried on the fallback.
+
+        stats["total_s"] counts only the time spent waiting on the model, not
+        the time the consumer spends between pieces.
+        """
+        name, model, budget, pinned = self._route(messages[-1]["content"], kind, model)
+        stats = {} if stats is None else stats
+        parts = []
+        while model:
+            stats.update(route=name, model=model)
+            stream = groq_chat_stream(messages, max_tokens=max_tokens or budget, temperature=temperature,
+                                      model=model, semantic_cache=semantic_cache, stats=stats)
+            waited, retry = 0.0, False
+            try:
+                while True:
+                    start = time.perf_counter()
+                    piece = next(stream, None)
+                    waited += time.perf_counter() - start
+                    if piece is None:
+                        break
+                    if not parts and self._rate_limited_error(stats):
+                        # Nothing shown yet, so the fallback can still answer from the start
+                        retry = True
+                        break
+                    parts.append(piece)
+                    yield piece
+            finally:
+                stream.close()
+                stats["total_s"] = waited
+                self.record(name, model, stats, repr(messages), "".join(parts))
+            model = self._fallback_after_429(name, model, stats, pinned) if retry else None
+        if retry:
+            # No fallback to try: show the error the primary ended with
+            yield f"[Groq error] {stats['error']}"
+
+    def faq(self, question: str, stats: dict = None):
+        name, model, budget, _ = self.pick(question, self.faq_kind(question))
+        stats = {} if stats is None else stats
+        while True:
+            try:
+                answer = answer_faq(question, model=model, max_tokens=budget, stats=stats)
+                break
+            except Exception as e:
+                stats.update(error=e)
+                self.record(name, model, stats)
+                model = self._fallback_after_429(name, model, stats)
+                if model is None:
+                    raise
+        self.record(name, model, stats, question, answer)
+        return answer
+
+    async def achat(self, messages, temperature: float = 0.15, kind: str = None, model: str = None,
+                    max_tokens: int = None, semantic_cache: bool = True, stats: dict = None):
+        name, model, budget, pinned = self._route(messages[-1]["content"], kind, model)
+        stats = {} if stats is None else stats
+        answer = await agroq_chat(messages, max_tokens=max_tokens or budget, temperature=temperature, model=model,
+                                  semantic_cache=semantic_cache, stats=stats)
+        self.record(name, model, stats, repr(messages), answer)
+        fallback = self._fallback_after_429(name, model, stats, pinned)
+        if fallback:
+            model = fallback
+            answer = await agroq_chat(messages, max_tokens=max_tokens or budget, temperature=temperature,
+                                      model=model, semantic_cache=semantic_cache, stats=stats)
+            self.record(name, model, stats, repr(messages), answer)
+        stats.update(route=name, model=model)
+        return answer
+
+    async def achat_stream(self, messages, temperature: float = 0.15, kind: str = None, model: str = None,
+                           max_tokens: int = None, semantic_cache: bool = True, stats: dict = None):
+        """Async chat_stream, for the JSON API."""
+        name, model, budget, pinned = self._route(messages[-1]["content"], kind, model)
+        stats = {} if stats is None else stats
+        parts = []
+        while model:
+            stats.update(route=name, model=model)
+            stream = agroq_chat_stream(messages, max_tokens=max_tokens or budget, temperature=temperature,
+                                       model=model, semantic_cache=semantic_cache, stats=stats)
+            waited, retry = 0.0, False
+            try:
+                while True:
+                    start = time.perf_counter()
+                    piece = await anext(stream, None)
+                    waited += time.perf_counter() - start
+                    if piece is None:
+                        break
+                    if not parts and self._rate_limited_error(stats):
+                        retry = True
+                        break
+                    parts.append(piece)
+                    yield piece
+            finally:
+                await stream.aclose()
+                stats["total_s"] = waited
+                self.record(name, model, stats, repr(messages), "".join(parts))
+            model = self._fallback_after_429(name, model, stats, pinned) if retry else None
+        if retry:
+            yield f"[Groq error] {stats['error']}"
+
+    async def afaq(self, question: str, stats: dict = None):
+        name, model, budget, _ = self.pick(question, self.faq_kind(question))
+        stats = {} if stats is None else stats
+        while True:
+            try:
+                answer = await aanswer_faq(question, model=model, max_tokens=budget, stats=stats)
+                break
+            except Exception as e:
+                stats.update(error=e)
+                self.record(name, model, stats)
+                model = self._fallback_after_429(name, model, stats)
+                if model is None:
+                    raise
+        self.record(name, model, stats, question, answer)
+        return answer
+
+
+model_router = ModelRouter()
@@ -0,0 +1,169 @@
+# pdf_export.py — Wrapped, paginated PDF rendering with a process-pool batch mode
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import metrics
+from timing import lazy_import
+
+LETTER = (612.0, 792.0)  # reportlab.lib.pagesizes.letter, without importing reportlab up front
+
+
+@lru_cache(maxsize=8192)
+def _width(text: str, font: str, size: float) -> float:
+    return lazy_import("reportlab.pdfbase.pdfmetrics").stringWidth(text, font, size)
+
+
+class PDFLayout:
+    """Page geometry and fonts, computed once and shared by every document."""
+
+    def __init__(self, pagesize=LETTER, margin: float = 50, title_font: str = "Helvetica-Bold",
+                 title_size: float = 16, body_font: str = "Helvetica", body_size: float = 11,
+                 leading: float = 16):
+        self.pagesize = pagesize
+        self.width, self.height = pagesize
+        self.margin = margin
+        self.title_font, self.title_size = title_font, title_size
+        self.body_font, self.body_size = body_font, body_size
+        self.leading = leading
+        self.text_width = self.width - 2 * margin
+        self.top = self.height - margin
+        self.bottom = margin
+
+    def _break_word(self, word: str, font: str, size: float) -> list:
+        pieces, current = [], ""
+        for ch in word:
+            if current and _width(current + ch, font, size) > self.text_width:
+                pieces.append(current)
+                current = ""
+            current += ch
+        return pieces + [current]
+
+    def wrap(self, text: str, font: str = None, size: float = None) -> list:
+        """Greedy word wrap to the text width; words wider than a line are hard-broken."""
+        font, size = font or self.body_font, size or self.body_size
+        lines = []
+        for paragraph in text.split("\n"):
+            words = paragraph.split()
+            if not words:
+                lines.append("")
+                continue
+            current = ""
+            for word in words:
+                candidate = f"{current} {word}" if current else word
+                if _width(candidate, font, size) <= self.text_width:
+                    current = candidate
+                    continue
+                if current:
+                    lines.append(current)
+                pieces = self._break_word(word, font, size)
+                lines.extend(pieces[:-1])
+                current = pieces[-1]
+            lines.append(current)
+        return lines
+
+
+DEFAULT_LAYOUT = PDFLayout()
+
+
+def render_pdf(title: str, content: str, out=None, layout: PDFLayout = DEFAULT_LAYOUT):
+    """Render to `out` (path or binary file object); returns a rewound BytesIO when out is None.
+
+    Pages are drawn straight into the target, so writing to a path never
+    holds a second copy of the document in memory.
+    """
+    with metrics.span("pdf_render"):
+        return _render_pdf(title, content, out, layout)
+
+
+def _render_pdf(title: str, content: str, out, layout: PDFLayout):
+    target = io.BytesIO() if out is None else out
+    pdf = lazy_import("reportlab.pdfgen.canvas").Canvas(target, pagesize=layout.pagesize, pageCompression=1)
+    pdf.setTitle(title)
+    y = layout.top
+
+    pdf.setFont(layout.title_font, layout.title_size)
+    for line in layout.wrap(title, layout.title_font, layout.title_size):
+        pdf.drawString(layout.margin, y, line)
+        y -= layout.title_size + 6
+    y -= 8
+
+    text = pdf.beginText(layout.margin, y)
+    text.setFont(layout.body_font, layout.body_size)
+    text.setLeading(layout.leading)
+    for line in layout.wrap(content):
+        if y < layout.bottom:
+            pdf.drawText(text)
+            pdf.showPage()
+            y = layout.top
+            text = pdf.beginText(layout.margin, y)
+            text.setFont(layout.body_font, layout.body_size)
+            text.setLeading(layout.leading)
+        text.textLine(line)
+        y -= layout.leading
+    pdf.drawText(text)
+    pdf.save()
+
+    if out is None:
+        target.seek(0)
+    return target
+
+
+def generate_pdf_bytes(title: str, content: str) -> io.BytesIO:
+    return render_pdf(title, content)
+
+
+# ---------------------------
+# Batch mode
+# ---------------------------
+def safe_filename(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("_") or "document"
+
+
+def _render_job(job) -> str:
+    path, title, content = job
+    with open(path, "wb") as f:
+        render_pdf(title, content, f)
+    return path
+
+
+def render_many(jobs, out_dir: str, max_workers: int = None, chunksize: int = 16) -> list:
+    """Render [(filename, title, content), ...] into out_dir in parallel; returns the file paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(os.path.join(out_dir, safe_filename(name)), title, content) for name, title, content in jobs]
+    if len(tasks) <= 1 or max_workers == 1:
+        return [_render_job(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_render_job, tasks, chunksize=chunksize))
+
+
+def zip_files(paths) -> bytes:
+    buff = io.BytesIO()
+    with zipfile.ZipFile(buff, "w", zipfile.ZIP_STORED) as zf:  # PDFs are already compressed
+        for path in paths:
+            zf.write(path, arcname=os.path.basename(path))
+    return buff.getvalue()
+
+
+def grade_report_jobs(graded, title: str = "Grade Report") -> list:
+    """One report job per row of a grading.grade_table() result."""
+    summary_cols = ["Total", "Percentage", "CGPA", "Grade", "Missing"]
+    subject_cols = graded.attrs.get("subjects")
+    if subject_cols is None:
+        subject_cols = [c for c in graded.select_dtypes(include="number").columns if c not in summary_cols]
+    id_cols = [c for c in graded.columns if c not in subject_cols and c not in summary_cols]
+    jobs = []
+    for i, row in enumerate(graded.to_dict("records"), 1):
+        who = " ".join(str(row[c]) for c in id_cols) or f"Student {i}"
+        lines = [f"{c}: {row[c]}" for c in id_cols]
+        lines += ["", "Subject-wise marks:"] + [f"  {c}: {row[c]}" for c in subject_cols]
+        if row["Grade"] == "Incomplete":
+            lines += ["", f"Grade: Incomplete (missing marks: {row.get('Missing', '')})"]
+        else:
+            lines += ["", f"Total: {row['Total']}", f"Percentage: {row['Percentage']:.2f}%",
+                      f"CGPA (Est): {row['CGPA']:.2f}", f"Grade: {row['Grade']}"]
+        jobs.append((f"{i:04d}_{who}.pdf", f"{title} — {who}", "\n".join(lines)))
+    return jobs
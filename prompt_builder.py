@@ -0,0 +1,83 @@
+# prompt_builder.py — Build per-question system prompts from only the relevant college sections
+import math
+
+import metrics
+from college_data import (COLLEGE_BROCHURE, OFFICIAL_SECTIONS, PROMPT_GUIDELINES, PROMPT_HEADER,
+                          SYSTEM_PROMPT)
+from faq_matcher import FAQ_SYNONYMS
+from text_search import BM25Index, build_synonym_map, tokenize
+
+PROMPT_TOKEN_BUDGET = 450
+ALWAYS_INCLUDE = ("overview",)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token holds well enough for English prose with Llama tokenizers
+    return math.ceil(len(text) / 4)
+
+
+class PromptBuilder:
+    def __init__(self, official_sections=OFFICIAL_SECTIONS, brochure: str = COLLEGE_BROCHURE,
+                 token_budget: int = PROMPT_TOKEN_BUDGET, full_prompt: str = SYSTEM_PROMPT):
+        self.sections = [(key, title, text) for key, title, text in official_sections]
+        self.sections.append(("brochure", "Brochure Summary", brochure.strip()))
+        self.token_budget = token_budget
+        self.synonyms = build_synonym_map(FAQ_SYNONYMS)
+        self.index = BM25Index([tokenize(f"{title} {title} {text}", self.synonyms)
+                                for _, title, text in self.sections])
+        self.section_tokens = [estimate_tokens(text) for _, _, text in self.sections]
+        self.full_prompt_tokens = estimate_tokens(full_prompt)
+
+    def select(self, question: str, token_budget: int = None) -> list:
+        """Indices of the sections to send, best first, within the token budget."""
+        budget = self.token_budget if token_budget is None else token_budget
+        budget -= estimate_tokens(PROMPT_HEADER) + estimate_tokens(PROMPT_GUIDELINES)
+
+        ranked = [idx for idx, _ in self.index.top_k(tokenize(question, self.synonyms), k=len(self.sections))]
+        if not ranked:
+            # Nothing matched lexically: give the general description rather than every fact
+            ranked = [len(self.sections) - 1]
+        always = [i for i, (key, _, _) in enumerate(self.sections) if key in ALWAYS_INCLUDE]
+
+        chosen, used = [], 0
+        for idx in always + ranked:
+            if idx in chosen:
+                continue
+            if used + self.section_tokens[idx] > budget and chosen:
+                continue
+            chosen.append(idx)
+            used += self.section_tokens[idx]
+        return chosen
+
+    def build(self, question: str, token_budget: int = None):
+        """Return (system prompt, info) where info reports the sections used and tokens saved."""
+        with metrics.span("prompt_build"):
+            prompt, info = self.compose(question, token_budget)
+        metrics.inc("assistant_prompt_tokens_saved_total", info["saved_tokens"])
+        return prompt, info
+
+    def compose(self, question: str, token_budget: int = None):
+        """build() without recording metrics, for offline callers (answer_store hashing and warm-up)."""
+        chosen = sorted(self.select(question, token_budget))
+        official = [self.sections[i] for i in chosen if self.sections[i][0] != "brochure"]
+        parts = [PROMPT_HEADER]
+        if official:
+            parts.append("--- OFFICIAL INFO (use this for factual answers) ---")
+            parts.extend(text for _, _, text in official)
+        if any(self.sections[i][0] == "brochure" for i in chosen):
+            parts.append("\n--- PROFESSIONAL BROCHURE SUMMARY (use for polished descriptions) ---")
+            parts.append(self.sections[-1][2])
+        parts.append(PROMPT_GUIDELINES)
+        prompt = "\n".join(parts)
+
+        prompt_tokens = estimate_tokens(prompt)
+        info = {
+            "sections": [self.sections[i][0] for i in chosen],
+            "prompt_tokens": prompt_tokens,
+            "full_prompt_tokens": self.full_prompt_tokens,
+            "saved_tokens": max(self.full_prompt_tokens - prompt_tokens, 0),
+        }
+        return prompt, info
+
+
+prompt_builder = PromptBuilder()
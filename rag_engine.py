@@ -1,23 +1,153 @@
-from langchain_community.vectorstores import Chroma
-from langchain_community.embeddings import OpenAIEmbeddings
-from openai import OpenAI
-from config import OPENAI_API_KEY
+import threading
+from functools import lru_cache
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+import config
+import metrics
+from llm_client import get_client, message_text
+from load_data import DB_DIR, EMBEDDING_MODEL, MMAP_INDEX_DIR, read_index_meta
+from text_search import BM25Index, tokenize
+from timing import lazy_import
 
-def ask_agent(query):
-    embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
-    db = Chroma(persist_directory="college_db", embedding_function=embeddings)
+RRF_K = 60               # reciprocal-rank-fusion damping constant
+CANDIDATES_PER_LIST = 20
+FAST_PATH_K = 1          # chunks returned when a lexical hit is unambiguous
+FAST_PATH_MARGIN = 2.0   # best BM25 score must be this many times the runner-up
+
+
+def reciprocal_rank_fusion(rankings, k: int = RRF_K) -> list:
+    """Fuse ranked lists of row ids into one list, best first."""
+    scores = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+# ---------------------------
+# Long-lived retriever
+# ---------------------------
+class Retriever:
+    """Opens the vector index once and embeds queries with the model it was built with.
+
+    backend="chroma" uses the Chroma store from load_documents(); backend="mmap"
+    uses the memory-mapped index from build_mmap_index() (config.VECTOR_BACKEND).
+    An inverted BM25 index over the same chunks is built alongside it, and
+    search() fuses both rankings; config.RAG_RERANKER names an optional
+    cross-encoder for the fused candidates.
+    """
+
+    def __init__(self, persist_directory: str = DB_DIR, query_cache_size: int = 2048, backend: str = None,
+                 reranker: str = None):
+        self.backend = backend or getattr(config, "VECTOR_BACKEND", "chroma")
+        self.persist_directory = persist_directory
+        self._Document = lazy_import("langchain_core.documents").Document
+        if self.backend == "mmap":
+            import vector_index
+
+            self.index = vector_index.MmapVectorIndex(MMAP_INDEX_DIR)
+            self.model_name = self.index.meta.get("embedding_model", EMBEDDING_MODEL)
+            self.model = lazy_import("sentence_transformers").SentenceTransformer(self.model_name, device="cpu")
+            self.texts, self.metadata = self.index.texts, self.index.metadata
+        else:
+            meta = read_index_meta(persist_directory)
+            self.model_name = meta.get("embedding_model", EMBEDDING_MODEL)
+            self.embeddings = lazy_import("langchain_huggingface").HuggingFaceEmbeddings(model_name=self.model_name)
+            self.db = lazy_import("langchain_community.vectorstores").Chroma(
+                persist_directory=persist_directory, embedding_function=self.embeddings)
+            stored = self.db.get(include=["documents", "metadatas"])
+            self.texts, self.metadata = stored["documents"], stored["metadatas"]
+        self._row_by_text = {text: row for row, text in enumerate(self.texts)}
+        self.bm25 = BM25Index([tokenize(text) for text in self.texts])
+        self._token_sets = [set(tokenize(text)) for text in self.texts]
+
+        reranker = reranker or getattr(config, "RAG_RERANKER", None)
+        self.reranker = lazy_import("sentence_transformers").CrossEncoder(reranker) if reranker else None
+        self._embed_query = lru_cache(maxsize=query_cache_size)(self._embed_query_uncached)
+
+    def _embed_query_uncached(self, query: str) -> tuple:
+        if self.backend == "mmap":
+            return tuple(self.model.encode(query, normalize_embeddings=True).tolist())
+        return tuple(self.embeddings.embed_query(query))
+
+    def embed_query(self, query: str) -> list:
+        return list(self._embed_query(" ".join(query.split())))
+
+    def _document(self, row: int):
+        return self._Document(page_content=self.texts[row], metadata=self.metadata[row] or {})
+
+    def vector_rows(self, query: str, k: int) -> list:
+        if self.backend == "mmap":
+            return [row for row, _ in self.index.search(self.embed_query(query), k=k)]
+        hits = self.db.similarity_search_by_vector(self.embed_query(query), k=k)
+        return [self._row_by_text[d.page_content] for d in hits if d.page_content in self._row_by_text]
 
-    results = db.similarity_search(query, k=3)
-    context = "\n\n".join([r.page_content for r in results])
+    def lexical_rows(self, query: str, k: int) -> list:
+        return self.bm25.top_k(tokenize(query), k=k)
+
+    def _fast_path(self, query: str, lexical: list):
+        """Rows to return without embedding when one chunk clearly wins on exact terms, else None."""
+        terms = set(tokenize(query))
+        if not lexical or not terms:
+            return None
+        best_row, best_score = lexical[0]
+        runner_up = lexical[1][1] if len(lexical) > 1 else 0.0
+        if terms <= self._token_sets[best_row] and best_score >= FAST_PATH_MARGIN * runner_up:
+            return [row for row, _ in lexical[:FAST_PATH_K]]
+        return None
+
+    def search(self, query: str, k: int = 3):
+        lexical = self.lexical_rows(query, CANDIDATES_PER_LIST)
+        fast = self._fast_path(query, lexical)
+        if fast is not None:
+            metrics.inc("assistant_retrieval_total", path="lexical_fast")
+            return [self._document(row) for row in fast]
+
+        metrics.inc("assistant_retrieval_total", path="hybrid")
+        fused = reciprocal_rank_fusion([[row for row, _ in lexical], self.vector_rows(query, CANDIDATES_PER_LIST)])
+        if self.reranker is not None and len(fused) > 1:
+            candidates = fused[:max(k * 4, 10)]
+            scores = self.reranker.predict([(query, self.texts[row]) for row in candidates])
+            fused = [row for _, row in sorted(zip(scores, candidates), key=lambda pair: pair[0], reverse=True)]
+        return [self._document(row) for row in fused[:k]]
+
+    def warm_up(self):
+        # Loads the model weights and touches the index so the first real query is fast
+        self.vector_rows("warm up", k=1)
+        if self.reranker is not None:
+            self.reranker.predict([("warm up", "warm up")])
+        self._embed_query.cache_clear()
+
+
+_retriever = None
+_retriever_lock = threading.Lock()
+
+
+def get_retriever() -> Retriever:
+    global _retriever
+    if _retriever is None:
+        with _retriever_lock:
+            if _retriever is None:
+                _retriever = Retriever()
+    return _retriever
+
+
+def warm_up():
+    get_retriever().warm_up()
+
+
+def ask_agent(query):
+    with metrics.span("retrieval"):
+        results = get_retriever().search(query, k=3)
+    with metrics.span("prompt_build", endpoint="rag"):
+        context = "\n\n".join([r.page_content for r in results])
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "You are a helpful AI Student Support agent."},
-            {"role": "user", "content": f"Context: {context}\n\nQuestion: {query}"}
-        ]
-    )
+    with metrics.span("llm_call", endpoint="rag"):
+        response = get_client("openai").chat(
+            [
+                {"role": "system", "content": "You are a helpful AI Student Support agent."},
+                {"role": "user", "content": f"Context: {context}\n\nQuestion: {query}"}
+            ],
+            model="gpt-4o-mini"
+        )
 
-    return response.choices[0].message["content"]
+    return message_text(response)
@@ -0,0 +1,110 @@
+# singleflight.py — Coalesce identical in-flight LLM requests across sessions
+import asyncio
+import hashlib
+import json
+import threading
+
+import metrics
+
+
+def request_key(messages, **params) -> str:
+    """Key on whitespace/case-normalised messages plus the model parameters.
+
+    Pass the call mode as a parameter (mode="stream" / "response"): a streaming
+    leader publishes answer text while a blocking one publishes the response
+    dict, so the two must never share a flight.
+    """
+    normalized = [{"role": m["role"], "content": " ".join(str(m["content"]).split()).casefold()} for m in messages]
+    payload = json.dumps({"messages": normalized, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LeaderAbandoned(Exception):
+    """The leader stopped before it had a result; the waiter should make the call itself."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+        self.waiters = 0
+
+
+class SingleFlight:
+    """At most one upstream call per key; concurrent callers wait and share its result."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._async_calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def begin(self, key: str):
+        """Return (call, is_leader). The leader must later call finish(key, call, ...)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                metrics.inc("assistant_coalesced_requests_total")
+                return call, False
+            call = self._calls[key] = _Call()
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key: str, call: _Call, result=None, error: BaseException = None, abandoned: bool = False):
+        """Publish the leader's outcome. `abandoned` (its reader went away) sends waiters to begin() again."""
+        call.result, call.error, call.abandoned = result, error, abandoned
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.done.set()
+
+    @staticmethod
+    def wait(call: _Call, timeout: float = None):
+        if not call.done.wait(timeout):
+            raise TimeoutError("timed out waiting for a coalesced request")
+        if call.abandoned:
+            raise LeaderAbandoned()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: str, fn, timeout: float = None):
+        """Run fn() once per key at a time. Returns (result, shared)."""
+        call, leader = self.begin(key)
+        if not leader:
+            return self.wait(call, timeout), True
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result=result)
+        return result, False
+
+    async def ado(self, key: str, coro_fn):
+        """asyncio flavour of do(); coalesces callers on the same event loop."""
+        future = self._async_calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            metrics.inc("assistant_coalesced_requests_total")
+            return await asyncio.shield(future), True
+        self.leaders += 1
+        future = self._async_calls[key] = asyncio.ensure_future(coro_fn())
+        try:
+            return await asyncio.shield(future), False
+        finally:
+            if self._async_calls.get(key) is future:
+                del self._async_calls[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"upstream_calls": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+# Shared by every Streamlit session in this process
+single_flight = SingleFlight()
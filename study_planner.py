@@ -0,0 +1,101 @@
+# study_planner.py — Study plans as four concurrent, separately budgeted LLM sections
+#
+# One 450-token completion for all four parts was slow (strictly sequential)
+# and often cut off mid-plan. Each section now has its own request and token
+# budget, so the whole plan takes about as long as its slowest section. The
+# sections stream side by side: worker threads feed their pieces into one
+# queue, which the caller (the Streamlit script thread) drains and renders.
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from model_router import model_router
+
+# key, title, instruction, max_tokens
+STUDY_SECTIONS = [
+    ("pomodoro", "2-Hour Pomodoro Plan",
+     "Write a 2-hour study session on {topic} broken into 25/5 Pomodoro cycles, with a goal for each cycle.", 350),
+    ("week", "7-Day Plan",
+     "Write a 7-day plan for learning {topic}: one line per day with what to study and how to review it.", 450),
+    ("tips", "Memory & Practice Tips",
+     "Give 5 specific memory and practice techniques for {topic}, one short bullet each.", 250),
+    ("question", "Practice Question",
+     "Write one exam-style practice question on {topic}, followed by a worked answer.", 300),
+]
+STUDY_TEMPERATURE = 0.3
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=4 * len(STUDY_SECTIONS), thread_name_prefix="study-plan")
+    return _executor
+
+
+def normalize_topic(topic: str) -> str:
+    return " ".join(topic.split())
+
+
+def section_messages(topic: str, instruction: str, system_prompt: str = None) -> list:
+    messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+    messages.append({"role": "user", "content": instruction.format(topic=normalize_topic(topic))})
+    return messages
+
+
+def _stream_section(events: queue.Queue, cancelled: threading.Event, key: str, messages: list,
+                    max_tokens: int, stats: dict):
+    try:
+        pieces = model_router.chat_stream(messages, kind="plan", max_tokens=max_tokens,
+                                          temperature=STUDY_TEMPERATURE, semantic_cache=False, stats=stats)
+        for piece in pieces:
+            if cancelled.is_set():
+                pieces.close()
+                break
+            events.put((key, piece))
+    finally:
+        events.put((key, None))
+
+
+def iter_study_plan(topic: str, system_prompt: str = None, stats: dict = None):
+    """Yield (key, title, piece) as the sections stream in, interleaved; piece is None once a section is done.
+
+    Sections go through the router's "plan" route (its model, each section's own
+    budget) and groq_chat_stream beneath it, so a topic asked before (any case or
+    spacing) is served from the answer cache and repeat requests in flight are
+    shared. Semantic matching is off: different topics produce near-identical
+    prompts. `stats`, if given, is filled with {key: stats of that section}.
+    """
+    stats = {} if stats is None else stats
+    titles = {key: title for key, title, _, _ in STUDY_SECTIONS}
+    events, cancelled = queue.Queue(), threading.Event()
+    start = time.perf_counter()
+    futures = [
+        _pool().submit(_stream_section, events, cancelled, key, section_messages(topic, instruction, system_prompt),
+                       max_tokens, stats.setdefault(key, {}))
+        for key, _, instruction, max_tokens in STUDY_SECTIONS
+    ]
+    try:
+        remaining = len(futures)
+        while remaining:
+            key, piece = events.get()
+            remaining -= piece is None
+            yield key, titles[key], piece
+        for future in futures:
+            future.result()
+    finally:
+        # A rerun that abandons the plan stops the sections still streaming
+        cancelled.set()
+        metrics.observe("assistant_stage_seconds", time.perf_counter() - start, stage="llm_call",
+                        endpoint="study_plan")
+
+
+def format_plan(sections: dict) -> str:
+    """Join finished sections {key: text} into one document in the canonical order."""
+    return "\n\n".join(f"{title}\n{sections[key]}" for key, title, _, _ in STUDY_SECTIONS if key in sections)
@@ -0,0 +1,19 @@
+import pytest
+
+import llm_client
+from answer_cache import answer_cache
+from benchmarks import fake_llm as fake_llm_server
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """A local fake Groq server behind a fresh client with fast backoff; yields the server."""
+    server = fake_llm_server.start_server(latency_s=0.01, tokens_per_s=0, completion_tokens=5)
+    client = llm_client.LLMClient(server.base_url, "test", max_retries=2, backoff_base=0.01, backoff_max=0.05)
+    monkeypatch.setitem(llm_client._clients, "groq", client)
+    answer_cache.clear()
+    yield server
+    answer_cache.clear()
+    client.close()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,29 @@
+from answer_cache import AnswerCache
+
+
+def test_rewordings_hit_and_different_questions_miss():
+    cache = AnswerCache()
+    cache.put("What courses are offered?", "ns", "BCA, BBA")
+    cache.put("Who is the principal?", "ns", "Dr. Rao")
+    assert cache.get("courses offered", "ns") == "BCA, BBA"
+    assert cache.get("Who is the vice principal?", "ns") is None
+    assert cache.get("courses offered", "other") is None
+    assert cache.get("courses offered", "ns", semantic=False) is None
+
+
+def test_paraphrase_from_the_request_hits_within_the_threshold():
+    cache = AnswerCache()
+    cache.put("what courses", "ns", "BCA, BBA")
+    assert cache.get("courses offered?", "ns") == "BCA, BBA"
+    assert cache.get("gym timings", "ns") is None
+    strict = AnswerCache(similarity_threshold=0.9)
+    strict.put("what courses", "ns", "BCA, BBA")
+    assert strict.get("courses offered?", "ns") is None
+
+
+def test_evicted_entries_are_not_served_as_near_duplicates():
+    cache = AnswerCache(max_entries=1)
+    cache.put("Is there a hostel?", "ns", "Yes")
+    cache.put("What are the fees?", "ns", "40k")
+    assert cache.get("hostel", "ns") is None
+    assert cache.get("fees", "ns") == "40k"
@@ -0,0 +1,38 @@
+import pytest
+from starlette.testclient import TestClient
+
+import api_server
+import llm_client
+
+
+@pytest.fixture
+def client():
+    with TestClient(api_server.app) as c:
+        yield c
+
+
+@pytest.mark.parametrize("body", [
+    '{"marks": {"Maths": null}}',
+    '{"students": [[80, null]]}',
+    '{"marks": {"Maths": {"score": 80}}}',
+    '{"students": [[80, 70], [60]]}',
+    '{"marks": {"Maths": 1e400}}',
+    '{"marks": {"Maths": 80}, "max_marks": 0}',
+    '{"marks": {"Maths": 80, "Physics": 70}, "max_marks": [100]}',
+])
+def test_grades_rejects_malformed_marks(client, body):
+    response = client.post("/grades", content=body, headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+
+
+def test_grades_per_subject_max_marks(client):
+    response = client.post("/grades", json={"marks": {"Maths": 45, "Physics": 90}, "max_marks": [50, 100]})
+    assert response.json()["percentage"] == [90.0]
+
+
+def test_chat_reports_upstream_failures_as_502(client, monkeypatch):
+    dead = llm_client.LLMClient("http://127.0.0.1:9/v1", "test", max_retries=0)
+    monkeypatch.setitem(llm_client._clients, "groq", dead)
+    assert client.post("/chat", json={"question": "Is there a hostel on campus?"}).status_code == 502
+    streamed = client.post("/chat", json={"question": "Is there a gym on campus?", "stream": True})
+    assert '"error": "[Groq error]' in streamed.text
@@ -0,0 +1,18 @@
+from chunker import chunk_text, strip_repeated_lines
+
+
+def test_repeated_list_items_under_different_entries_are_kept():
+    text = ("Courses\n\nBCA\n- Duration: 3 years\n- Eligibility: PUC\n\n"
+            "BBA\n- Duration: 3 years\n- Eligibility: PUC")
+    body = "\n".join(chunk for chunk, _ in chunk_text(text))
+    assert body.count("Duration: 3 years") == 2
+    assert body.count("Eligibility: PUC") == 2
+    assert body.index("BBA") < body.rindex("Duration: 3 years")
+
+
+def test_running_headers_and_page_numbers_are_stripped_per_file():
+    topics = ["Admissions open in June.", "Library hours are 9 to 5.", "Hostel rooms are shared.",
+              "Fees are paid online."]
+    pages = [f"RNSFGC Handbook\n{topic}\nPage {n} of 4" for n, topic in enumerate(topics, 1)]
+    assert strip_repeated_lines(pages) == topics
+    assert strip_repeated_lines(pages[:2]) == pages[:2]
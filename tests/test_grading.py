@@ -0,0 +1,31 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from grading import INCOMPLETE, compute_grades, grade_table, read_marks_table, subject_columns
+
+
+def test_compute_grades_for_a_class_with_per_subject_maximums():
+    result = compute_grades([[45, 90], [20, 40]], max_marks=[50, 100])
+    assert result["total"].tolist() == [135, 60]
+    assert result["percentage"].tolist() == [90.0, 40.0]
+    assert result["grade"].tolist() == ["A+", "Fail"]
+    assert np.allclose(result["cgpa"], [90 / 9.5, 40 / 9.5])
+
+
+def test_grade_table_skips_id_columns_and_flags_missing_marks():
+    df = pd.read_csv(io.StringIO("Name,Roll No,Maths,Physics\nAsha,101,90,80\nRavi,102,,70\n"))
+    assert subject_columns(df) == ["Maths", "Physics"]
+    graded = grade_table(df)
+    assert graded["Total"].iloc[0] == 170
+    assert graded["Grade"].tolist() == ["A", INCOMPLETE]
+    assert np.isnan(graded["Total"].iloc[1]) and graded["Missing"].iloc[1] == "Maths"
+    with pytest.raises(ValueError):
+        grade_table(df, subjects=["Name"])
+
+
+def test_xls_uploads_are_rejected():
+    with pytest.raises(ValueError, match="xlsx"):
+        read_marks_table(b"", "marks.xls")
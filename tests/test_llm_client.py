@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+import llm_client
+from llm_client import LLMError, get_client
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+MODEL = "llama-3.1-8b-instant"
+
+
+def test_429_is_retried_after_retry_after(fake_llm):
+    client = get_client("groq")
+    fake_llm.rate_limit_every, fake_llm.retry_after = 2, "0.2"  # the second request is rate-limited
+    client.chat(MESSAGES, model=MODEL)
+    start = time.perf_counter()
+    assert client.chat(MESSAGES, model=MODEL)["choices"]
+    assert time.perf_counter() - start >= 0.2
+    assert fake_llm.requests == 3
+
+
+def test_429_marks_only_that_model_for_the_cooldown(fake_llm, monkeypatch):
+    monkeypatch.setattr(llm_client, "RATE_LIMIT_COOLDOWN", 0.3)
+    client = get_client("groq")
+    fake_llm.rate_limit_every, fake_llm.retry_after = 2, ""  # no Retry-After: the cooldown applies
+    client.chat(MESSAGES, model=MODEL)
+    client.chat(MESSAGES, model=MODEL)
+    assert client.rate_limited(MODEL) and not client.rate_limited("other-model")
+    time.sleep(0.35)
+    assert not client.rate_limited(MODEL)
+
+
+def test_5xx_is_retried_without_marking_the_model(fake_llm):
+    client = get_client("groq")
+    fake_llm.rate_limit_every, fake_llm.error_status = 2, 503
+    client.chat(MESSAGES, model=MODEL)
+    assert client.chat(MESSAGES, model=MODEL)["choices"]
+    assert fake_llm.requests == 3
+    assert not client.rate_limited(MODEL)
+
+
+def test_malformed_retry_after_falls_back_to_backoff(fake_llm):
+    client = get_client("groq")
+    fake_llm.rate_limit_every, fake_llm.retry_after = 2, "soon"
+    client.chat(MESSAGES, model=MODEL)
+    assert client.chat(MESSAGES, model=MODEL)["choices"]
+    assert client.rate_limited(MODEL)  # no usable Retry-After: the cooldown applies
+
+
+def test_gives_up_after_max_retries(fake_llm):
+    fake_llm.rate_limit_every = 1
+    with pytest.raises(LLMError) as error:
+        get_client("groq").chat(MESSAGES, model=MODEL)
+    assert error.value.status == 429
+    assert fake_llm.requests == 3  # max_retries=2 in the fixture
+
+
+def test_stream_is_retried_before_the_first_delta(fake_llm):
+    client = get_client("groq")
+    fake_llm.rate_limit_every = 2
+    client.chat(MESSAGES, model=MODEL)
+    assert "".join(client.stream_chat(MESSAGES, model=MODEL)) == "tok0 tok1 tok2 tok3 tok4 "
+
+
+def test_stream_is_not_retried_after_a_delta(fake_llm):
+    fake_llm.drop_stream_after = 2
+    pieces = []
+    with pytest.raises(LLMError):
+        for piece in get_client("groq").stream_chat(MESSAGES, model=MODEL):
+            pieces.append(piece)
+    assert pieces == ["tok0 ", "tok1 "]
+    assert fake_llm.requests == 1
@@ -0,0 +1,30 @@
+import pytest
+
+import config
+from model_router import ModelRouter, classify
+
+
+def test_describe_requests_are_not_routed_as_facts():
+    assert classify("Can you describe the campus facilities and the library and labs?") == "descriptive"
+    assert classify("Is there a hostel on campus?") == "factual"
+
+
+def test_plan_needs_a_generate_verb_and_a_plan_noun():
+    assert classify("What is the revision policy for exam results") != "plan"
+    assert classify("Suggest some good books") != "plan"
+    assert classify("Make me a weekly revision timetable for physics") == "plan"
+
+
+def test_faq_traffic_never_takes_the_plan_route():
+    assert ModelRouter.faq_kind("Create a study plan for DBMS") == "descriptive"
+
+
+def test_model_routes_overrides_are_validated(monkeypatch):
+    monkeypatch.setattr(config, "MODEL_ROUTES", {"plan": {"max_tokens": 600}}, raising=False)
+    assert ModelRouter().routes["plan"]["max_tokens"] == 600
+    monkeypatch.setattr(config, "MODEL_ROUTES", {"summary": {"max_tokens": 300}}, raising=False)
+    with pytest.raises(ValueError, match="missing"):
+        ModelRouter()
+    monkeypatch.setattr(config, "MODEL_ROUTES", {"plan": {"budget": 300}}, raising=False)
+    with pytest.raises(ValueError, match="unknown"):
+        ModelRouter()
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from assistant import groq_chat_stream
+from singleflight import SingleFlight, request_key, single_flight
+
+MESSAGES = [{"role": "user", "content": "When does orientation start?"}]
+
+
+def test_concurrent_callers_share_one_call():
+    flight, calls, results = SingleFlight(), [], []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", fn))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while flight.coalesced < 3:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert {answer for answer, _ in results} == {"answer"}
+
+
+def test_waiter_makes_its_own_call_when_the_leader_abandons(fake_llm):
+    fake_llm.tokens_per_s = 20  # slow enough for the waiter to join mid-stream
+    leader = groq_chat_stream(MESSAGES, semantic_cache=False)
+    next(leader)
+
+    key = request_key(MESSAGES, mode="stream", model="llama-3.1-8b-instant", max_tokens=400, temperature=0.15)
+    stats, pieces = {}, []
+    waiter = threading.Thread(target=lambda: pieces.extend(groq_chat_stream(MESSAGES, semantic_cache=False,
+                                                                            stats=stats)))
+    waiter.start()
+    while single_flight._calls[key].waiters == 0:
+        time.sleep(0.001)
+    leader.close()  # e.g. the leader's student clicked another widget mid-answer
+    waiter.join(10)
+
+    assert "".join(pieces).strip() == "tok0 tok1 tok2 tok3 tok4"
+    assert stats["error"] is None and not stats["coalesced"]
@@ -0,0 +1,34 @@
+import pytest
+
+from todo_store import TodoStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TodoStore(str(tmp_path / "student_data.db"), flush_seconds=60)
+
+
+def test_tasks_are_per_user_and_paged_oldest_first(store):
+    ids = [store.add_task("alice", f"task {i}") for i in range(5)]
+    store.add_task("bob", "someone else's task")
+    store.set_status("alice", ids[1], "done")
+    store.set_status("bob", ids[2], "done")  # another user's id: ignored
+
+    assert store.count_tasks("alice") == 5
+    assert store.count_tasks("alice", "open") == 4
+    assert store.list_tasks("alice", page=1, page_size=2) == [(ids[2], "task 2", "open"), (ids[3], "task 3", "open")]
+    assert [text for _, text, _ in store.list_tasks("alice", "done")] == ["task 1"]
+    store.clear_tasks("alice", "done")
+    assert store.count_tasks("alice") == 4 and store.count_tasks("bob") == 1
+    with pytest.raises(ValueError):
+        store.set_status("alice", ids[0], "archived")
+
+
+def test_notes_are_buffered_until_flushed(store, tmp_path):
+    store.save_note("alice", "first draft")
+    store.save_note("alice", "second draft")
+    assert store.get_note("alice") == "second draft"
+    assert TodoStore(str(tmp_path / "student_data.db")).get_note("alice") == ""
+
+    assert store.flush_notes() == 1
+    assert TodoStore(str(tmp_path / "student_data.db")).get_note("alice") == "second draft"
@@ -0,0 +1,75 @@
+# text_search.py — Tokenizer and inverted BM25 index shared by the local matchers
+import math
+import re
+from collections import Counter, defaultdict
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:[.@_-][a-z0-9]+)*")
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "of", "in", "on", "for", "to", "and", "or",
+    "what", "which", "who", "how", "do", "does", "can", "i", "you", "me", "my", "your", "about",
+    "please", "tell", "give", "there", "it", "its", "at", "by", "be", "any", "all", "with",
+}
+
+
+def stem(word: str) -> str:
+    for suffix in ("ies", "es", "s", "ed", "ing"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return word
+
+
+def tokenize(text: str, synonyms: dict = None) -> list:
+    """Lower-case content words, stemmed and mapped onto their canonical synonym."""
+    tokens = []
+    for word in WORD_RE.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        word = stem(word)
+        if synonyms:
+            word = synonyms.get(word, word)
+        tokens.append(word)
+    return tokens
+
+
+def build_synonym_map(groups: dict) -> dict:
+    """Flatten {canonical: [aliases]} into {alias token: canonical}."""
+    mapping = {}
+    for canonical, aliases in groups.items():
+        for alias in aliases:
+            for token in tokenize(alias):
+                mapping[token] = canonical
+    return mapping
+
+
+class BM25Index:
+    def __init__(self, docs_tokens, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_count = len(docs_tokens)
+        self.doc_lens = [len(t) for t in docs_tokens]
+        self.avg_len = (sum(self.doc_lens) / self.doc_count) if self.doc_count else 0.0
+        self.postings = defaultdict(list)  # term -> [(doc index, term frequency)]
+        for idx, tokens in enumerate(docs_tokens):
+            for term, tf in Counter(tokens).items():
+                self.postings[term].append((idx, tf))
+        self.idf = {
+            term: math.log(1 + (self.doc_count - len(plist) + 0.5) / (len(plist) + 0.5))
+            for term, plist in self.postings.items()
+        }
+
+    def scores(self, query_tokens) -> dict:
+        """Sparse scores: only documents sharing at least one term appear."""
+        result = defaultdict(float)
+        for term in set(query_tokens):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            idf = self.idf[term]
+            for idx, tf in plist:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lens[idx] / (self.avg_len or 1.0))
+                result[idx] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return result
+
+    def top_k(self, query_tokens, k: int = 3) -> list:
+        ranked = sorted(self.scores(query_tokens).items(), key=lambda item: item[1], reverse=True)
+        return ranked[:k]
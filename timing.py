@@ -0,0 +1,84 @@
+# timing.py — Cold-start import costs and per-rerun section timings
+import importlib
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import metrics
+
+PROCESS_START = time.perf_counter()
+
+IMPORT_TIMES = {}  # module name -> seconds spent on its first import in this process
+_import_lock = threading.Lock()
+_loaded = {}  # module name -> module, once lazy_import has fully imported it
+
+# section name -> recent durations (seconds) across every rerun in this process
+SECTION_HISTORY = defaultdict(lambda: deque(maxlen=500))
+
+
+def lazy_import(name: str):
+    """Import a heavy dependency on first use and remember how long it took."""
+    # Only modules import_module has finished with are served without the lock;
+    # sys.modules also holds modules another thread is still importing.
+    module = _loaded.get(name)
+    if module is not None:
+        return module
+    with _import_lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_TIMES.setdefault(name, time.perf_counter() - start)
+        _loaded[name] = module
+    return module
+
+
+class RerunTimer:
+    """Collects section timings for one script run; create one at the top of the script."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sections = {}
+
+    @contextmanager
+    def section(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.sections[name] = self.sections.get(name, 0.0) + elapsed
+            SECTION_HISTORY[name].append(elapsed)
+            metrics.observe("assistant_rerun_section_seconds", elapsed, section=name)
+
+    def total(self) -> float:
+        return time.perf_counter() - self.start
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+def report(timer: RerunTimer = None) -> list:
+    """Rows of {section, this_run_ms, mean_ms, p95_ms, runs} plus import rows, for display."""
+    rows = []
+    for name, history in SECTION_HISTORY.items():
+        values = list(history)
+        rows.append({
+            "section": name,
+            "this_run_ms": round(timer.sections.get(name, 0.0) * 1000, 2) if timer else None,
+            "mean_ms": round(sum(values) / len(values) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "runs": len(values),
+        })
+    for name, seconds in sorted(IMPORT_TIMES.items(), key=lambda item: -item[1]):
+        rows.append({"section": f"import {name}", "this_run_ms": None,
+                     "mean_ms": round(seconds * 1000, 2), "p95_ms": None, "runs": 1})
+    return rows
+
+
+def render_report(st, timer: RerunTimer):
+    """Sidebar expander with the timing table; `st` is the streamlit module."""
+    with st.sidebar.expander("⏱ Startup & rerun timings"):
+        st.caption(f"Process up {time.perf_counter() - PROCESS_START:.1f}s · this rerun {timer.total() * 1000:.1f} ms")
+        st.dataframe(report(timer), width="stretch", hide_index=True)
@@ -0,0 +1,168 @@
+# todo_store.py — Persistent per-user to-do lists and notes (SQLite, WAL mode)
+#
+# One database file per deployment (config.STUDENT_DB_PATH; put it on the
+# persistent volume). WAL lets readers in every session proceed while a write
+# commits, and note edits are buffered and flushed in batches by a background
+# thread, so typing never waits on the disk.
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+import config
+import metrics
+
+DB_PATH = "student_data.db"
+PAGE_SIZE = 20
+NOTE_FLUSH_SECONDS = 2.0
+STATUSES = ("open", "done")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS todos (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id    TEXT NOT NULL,
+    text       TEXT NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'open',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_todos_user_status ON todos (user_id, status, id);
+CREATE TABLE IF NOT EXISTS notes (
+    user_id    TEXT PRIMARY KEY,
+    body       TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class TodoStore:
+    def __init__(self, path: str = None, flush_seconds: float = NOTE_FLUSH_SECONDS):
+        self.path = path or getattr(config, "STUDENT_DB_PATH", DB_PATH)
+        self.flush_seconds = flush_seconds
+        self._local = threading.local()
+        self._pending_notes = {}       # user_id -> (body, edited_at), not yet on disk
+        self._notes_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        threading.Thread(target=self._flush_loop, name="note-flusher", daemon=True).start()
+        atexit.register(self.flush_notes)
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads; Streamlit runs each session on its own
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------------------------
+    # To-do items
+    # ---------------------------
+    def add_task(self, user_id: str, text: str) -> int:
+        with metrics.span("todo_write"), self._connect() as conn:
+            cur = conn.execute("INSERT INTO todos (user_id, text, created_at) VALUES (?, ?, ?)",
+                               (user_id, text, time.time()))
+        return cur.lastrowid
+
+    def set_status(self, user_id: str, task_id: int, status: str):
+        if status not in STATUSES:
+            raise ValueError(f"status must be one of {STATUSES}")
+        with metrics.span("todo_write"), self._connect() as conn:
+            conn.execute("UPDATE todos SET status = ? WHERE id = ? AND user_id = ?", (status, task_id, user_id))
+
+    def clear_tasks(self, user_id: str, status: str = None):
+        with metrics.span("todo_write"), self._connect() as conn:
+            if status is None:
+                conn.execute("DELETE FROM todos WHERE user_id = ?", (user_id,))
+            else:
+                conn.execute("DELETE FROM todos WHERE user_id = ? AND status = ?", (user_id, status))
+
+    def count_tasks(self, user_id: str, status: str = None) -> int:
+        if status is None:
+            row = self._connect().execute("SELECT COUNT(*) FROM todos WHERE user_id = ?", (user_id,)).fetchone()
+        else:
+            row = self._connect().execute("SELECT COUNT(*) FROM todos WHERE user_id = ? AND status = ?",
+                                          (user_id, status)).fetchone()
+        return row[0]
+
+    def list_tasks(self, user_id: str, status: str = None, page: int = 0, page_size: int = PAGE_SIZE) -> list:
+        """One page of [(id, text, status)], oldest first, read straight off the (user, status) index."""
+        with metrics.span("todo_read"):
+            if status is None:
+                rows = self._connect().execute(
+                    "SELECT id, text, status FROM todos WHERE user_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                    (user_id, page_size, page * page_size))
+            else:
+                rows = self._connect().execute(
+                    "SELECT id, text, status FROM todos WHERE user_id = ? AND status = ? ORDER BY id LIMIT ? OFFSET ?",
+                    (user_id, status, page_size, page * page_size))
+            return rows.fetchall()
+
+    # ---------------------------
+    # Notes (debounced)
+    # ---------------------------
+    def get_note(self, user_id: str) -> str:
+        with self._notes_lock:
+            if user_id in self._pending_notes:
+                return self._pending_notes[user_id][0]
+        row = self._connect().execute("SELECT body FROM notes WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else ""
+
+    def save_note(self, user_id: str, body: str):
+        """Buffer the latest text; the flusher writes it once edits have been quiet for flush_seconds."""
+        with self._notes_lock:
+            self._pending_notes[user_id] = (body, time.monotonic())
+        self._flush_event.set()
+
+    def flush_notes(self, older_than: float = 0.0) -> int:
+        """Write buffered notes untouched for `older_than` seconds in one transaction; returns how many."""
+        now = time.monotonic()
+        with self._notes_lock:
+            ready = {u: body for u, (body, edited) in self._pending_notes.items() if now - edited >= older_than}
+            for user_id in ready:
+                del self._pending_notes[user_id]
+        if not ready:
+            return 0
+        try:
+            with metrics.span("note_flush"), self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO notes (user_id, body, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET body = excluded.body, updated_at = excluded.updated_at",
+                    [(user_id, body, time.time()) for user_id, body in ready.items()])
+        except sqlite3.Error as e:
+            metrics.record_error("note_flush", e)
+            with self._notes_lock:
+                # Put them back unless a newer edit arrived meanwhile
+                for user_id, body in ready.items():
+                    self._pending_notes.setdefault(user_id, (body, now))
+            return 0
+        metrics.inc("assistant_note_writes_total", amount=len(ready))
+        return len(ready)
+
+    def _flush_loop(self):
+        while True:
+            self._flush_event.wait()
+            time.sleep(self.flush_seconds)
+            with self._notes_lock:
+                if not self._pending_notes:
+                    self._flush_event.clear()
+            self.flush_notes(older_than=self.flush_seconds)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_todo_store() -> TodoStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TodoStore()
+    return _store
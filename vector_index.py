@@ -0,0 +1,169 @@
+# vector_index.py — Batched multi-process embedding and a compact, memory-mapped vector index
+#
+# Layout of an index directory:
+#   vectors.npy   (n, dim) float16, or int8 with a per-row scale in scales.npy
+#   docs.json     ids, texts and metadata, row-aligned with vectors.npy
+#   meta.json     embedding model, dtype, dim, count
+# Vectors are L2-normalised, so a dot product is the cosine similarity. Loading
+# with mmap_mode="r" lets every worker process share the page-cached file.
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from timing import lazy_import
+
+VECTORS_FILE = "vectors.npy"
+SCALES_FILE = "scales.npy"
+DOCS_FILE = "docs.json"
+META_FILE = "meta.json"
+SEARCH_BLOCK_ROWS = 65536
+
+_worker_model = None
+
+
+# ---------------------------
+# Embedding
+# ---------------------------
+def _init_worker(model_name: str):
+    global _worker_model
+    _worker_model = lazy_import("sentence_transformers").SentenceTransformer(model_name, device="cpu")
+
+
+def _embed_batch(texts) -> np.ndarray:
+    return _worker_model.encode(list(texts), batch_size=len(texts), normalize_embeddings=True,
+                                convert_to_numpy=True, show_progress_bar=False).astype(np.float32)
+
+
+def embed_texts(texts, model_name: str, batch_size: int = 64, workers: int = None) -> np.ndarray:
+    """Embed texts in batches spread over a process pool; one model copy per worker."""
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    workers = min(workers or os.cpu_count() or 1, len(batches))
+    if workers <= 1:
+        _init_worker(model_name)
+        return np.vstack([_embed_batch(b) for b in batches])
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_name,)) as pool:
+        return np.vstack(list(pool.map(_embed_batch, batches)))
+
+
+# ---------------------------
+# Quantisation
+# ---------------------------
+def quantize(vectors: np.ndarray, dtype: str):
+    """Return (stored array, per-row scales or None)."""
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    raise ValueError(f"Unsupported index dtype: {dtype}")
+
+
+def _read_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def build_index(docs, out_dir: str, model_name: str, dtype: str = "float16", batch_size: int = 64,
+                workers: int = None) -> dict:
+    """Write an index for docs = [(id, text, metadata), ...].
+
+    Rows of an existing index with the same model and dtype are reused by id,
+    so only new or changed chunks are embedded.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    docs = list(docs)
+    ids = [d[0] for d in docs]
+
+    old, old_rows = None, {}
+    old_meta = _read_json(os.path.join(out_dir, META_FILE), {})
+    if old_meta.get("embedding_model") == model_name and old_meta.get("dtype") == dtype:
+        old = MmapVectorIndex(out_dir)
+        old_rows = {doc_id: row for row, doc_id in enumerate(old.ids)}
+
+    missing = [i for i, doc_id in enumerate(ids) if doc_id not in old_rows]
+    fresh, fresh_scales = quantize(embed_texts([docs[i][1] for i in missing], model_name, batch_size, workers),
+                                   dtype) if missing else (None, None)
+
+    dim = fresh.shape[1] if fresh is not None else old.vectors.shape[1] if old_rows else 0
+    vectors = np.empty((len(docs), dim), dtype=np.int8 if dtype == "int8" else np.float16)
+    scales = np.empty(len(docs), dtype=np.float32) if dtype == "int8" else None
+    for row, doc_id in enumerate(ids):
+        if doc_id in old_rows:
+            vectors[row] = old.vectors[old_rows[doc_id]]
+            if scales is not None:
+                scales[row] = old.scales[old_rows[doc_id]]
+    if missing:
+        vectors[missing] = fresh
+        if scales is not None:
+            scales[missing] = fresh_scales
+    old = None  # drop the mmap before replacing its file
+
+    tmp_vectors = os.path.join(out_dir, VECTORS_FILE + ".tmp.npy")
+    np.save(tmp_vectors, vectors)
+    os.replace(tmp_vectors, os.path.join(out_dir, VECTORS_FILE))
+    if scales is not None:
+        tmp_scales = os.path.join(out_dir, SCALES_FILE + ".tmp.npy")
+        np.save(tmp_scales, scales)
+        os.replace(tmp_scales, os.path.join(out_dir, SCALES_FILE))
+    _write_json(os.path.join(out_dir, DOCS_FILE),
+                {"ids": ids, "texts": [d[1] for d in docs], "metadata": [d[2] for d in docs]})
+    _write_json(os.path.join(out_dir, META_FILE),
+                {"embedding_model": model_name, "dtype": dtype, "dim": dim, "count": len(docs)})
+
+    return {"embedded": len(missing), "reused": len(docs) - len(missing), "bytes": vectors.nbytes}
+
+
+# ---------------------------
+# Query side
+# ---------------------------
+class MmapVectorIndex:
+    def __init__(self, index_dir: str):
+        self.meta = _read_json(os.path.join(index_dir, META_FILE), {})
+        self.vectors = np.load(os.path.join(index_dir, VECTORS_FILE), mmap_mode="r")
+        scales_path = os.path.join(index_dir, SCALES_FILE)
+        self.scales = np.load(scales_path, mmap_mode="r") if self.meta.get("dtype") == "int8" else None
+        docs = _read_json(os.path.join(index_dir, DOCS_FILE), {"ids": [], "texts": [], "metadata": []})
+        self.ids, self.texts, self.metadata = docs["ids"], docs["texts"], docs["metadata"]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def scores(self, query_vector) -> np.ndarray:
+        """Cosine scores for every row, computed block by block to bound temporary memory."""
+        q = np.asarray(query_vector, dtype=np.float32)
+        out = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), SEARCH_BLOCK_ROWS):
+            block = np.asarray(self.vectors[start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+            out[start:start + len(block)] = block @ q
+        if self.scales is not None:
+            out *= self.scales
+        return out
+
+    def search(self, query_vector, k: int = 3) -> list:
+        """Top-k (row, score) pairs, best first."""
+        if not len(self):
+            return []
+        scores = self.scores(query_vector)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+
+def index_exists(index_dir: str) -> bool:
+    return os.path.exists(os.path.join(index_dir, META_FILE))